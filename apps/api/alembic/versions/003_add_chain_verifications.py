@@ -0,0 +1,31 @@
+"""Add chain_verifications table for incremental scans.
+
+Revision ID: 003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chain_verifications",
+        sa.Column(
+            "chain_id", sa.String(36),
+            sa.ForeignKey("chains.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("last_verified_index", sa.Integer, nullable=False),
+        sa.Column("last_verified_y", sa.String(64), nullable=False),
+        sa.Column("last_verified_xy", sa.String(67), nullable=False),
+        sa.Column("verified_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chain_verifications")
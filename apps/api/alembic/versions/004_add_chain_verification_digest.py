@@ -0,0 +1,24 @@
+"""Add a digest of the verified prefix to chain_verifications.
+
+Revision ID: 004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL and are treated as having no verified prefix
+    op.add_column(
+        "chain_verifications", sa.Column("prefix_digest", sa.String(64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("chain_verifications", "prefix_digest")
@@ -10,6 +10,9 @@ from dataclasses import dataclass
 
 logger = logging.getLogger("pruv.api.config")
 
+# Local SQLite file used when DATABASE_URL is not set (development only)
+DEV_DATABASE_URL = "sqlite:///pruv_dev.db"
+
 
 @dataclass
 class Settings:
@@ -63,6 +66,11 @@ class Settings:
     # CORS
     cors_origins: list[str] | None = None
 
+    @property
+    def effective_database_url(self) -> str:
+        """DATABASE_URL, or the local development SQLite file."""
+        return self.database_url or DEV_DATABASE_URL
+
     @classmethod
     def from_env(cls) -> "Settings":
         return cls(
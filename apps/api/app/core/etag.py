@@ -0,0 +1,37 @@
+"""ETag helpers for conditional GET requests."""
+
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object) -> str:
+    """Build a weak ETag from the values that identify a representation."""
+    digest = hashlib.sha256(
+        ":".join(str(p) for p in parts).encode("utf-8")
+    ).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag.
+
+    Uses the weak comparison from RFC 9110 — the W/ prefix is ignored
+    on both sides, and "*" matches any current representation.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == wanted for tag in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty 304 response carrying the ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
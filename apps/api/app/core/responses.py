@@ -0,0 +1,54 @@
+"""Response classes for read-heavy endpoints."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson.
+
+    For routes whose service layer already returns the final dict shape,
+    this skips the outbound Pydantic validate/dump pass. orjson encodes
+    datetimes in the same ISO 8601 form Pydantic uses. Routers set it as
+    their default_response_class; response_model stays on each route for
+    the OpenAPI docs only.
+
+    orjson rejects integers wider than 64 bits, which user-supplied
+    metadata and state may hold; those bodies fall back to the standard
+    JSON encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().render(jsonable_encoder(content))
+
+
+def list_response(
+    key: str,
+    adapter: TypeAdapter[list[Any]],
+    items: list[Any],
+    headers: dict[str, str] | None = None,
+    **fields: Any,
+) -> Response:
+    """Validate ``items`` with ``adapter`` and encode them under ``key``.
+
+    The list goes through Pydantic's JSON encoder in one call, which also
+    keeps integers beyond 64 bits in user-supplied state intact (orjson
+    rejects them). The remaining scalar ``fields`` are encoded with orjson.
+    """
+    body = adapter.dump_json(adapter.validate_python(items))
+    tail = orjson.dumps(fields)[1:] if fields else b"}"
+    sep = b"," if fields else b""
+    return Response(
+        content=b'{"' + key.encode() + b'":' + body + sep + tail,
+        media_type="application/json",
+        headers=headers,
+    )
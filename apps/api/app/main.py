@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -13,7 +14,7 @@ from fastapi.responses import JSONResponse
 from .core.config import settings
 from .middleware.cors import CORSConfig, SecurityHeadersMiddleware
 from .middleware.logging import RequestLoggingMiddleware
-from .models.database import Base, get_engine
+from .models.database import Base, dispose_engines, get_engine
 from .routes import admin, analytics, auth, chains, checkpoints, dashboard, identity, provenance, receipts, scans, verify, webhooks
 from .schemas.schemas import HealthResponse
 
@@ -23,7 +24,7 @@ logger = logging.getLogger("pruv.api")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Create database tables on startup and initialize services."""
-    db_url = settings.database_url or "sqlite:///pruv_dev.db"
+    db_url = settings.effective_database_url
     try:
         engine = get_engine(db_url)
         Base.metadata.create_all(bind=engine)
@@ -42,10 +43,15 @@ async def lifespan(app: FastAPI):
         receipt_service.init_db(db_url)
         identity_service.init_db(db_url)
         provenance_service.init_db(db_url)
+        scans.init_db(db_url)
         logger.info("Services initialized.")
     except Exception:
         logger.exception("Failed to initialize database.")
+    await scans.open_http_client()
     yield
+    await scans.close_http_client()
+    await asyncio.to_thread(scans.scan_writer.close, 10.0)
+    dispose_engines()
 
 
 app = FastAPI(
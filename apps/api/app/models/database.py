@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import uuid
 from datetime import datetime
+from typing import Any
 
+import orjson
 from sqlalchemy import (
     Boolean,
     Column,
@@ -19,6 +22,7 @@ from sqlalchemy import (
     func,
 )
 from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 
@@ -125,6 +129,20 @@ class Entry(Base):
     )
 
 
+class ChainVerification(Base):
+    """Verified prefix of a chain, so later scans only check the tail."""
+
+    __tablename__ = "chain_verifications"
+
+    chain_id = Column(String(36), ForeignKey("chains.id", ondelete="CASCADE"), primary_key=True)
+    last_verified_index = Column(Integer, nullable=False)
+    last_verified_y = Column(String(64), nullable=False)
+    last_verified_xy = Column(String(67), nullable=False)
+    # SHA-256 over the checked fields of every entry up to the one above
+    prefix_digest = Column(String(64), nullable=True)
+    verified_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
 class ChainCheckpoint(Base):
     __tablename__ = "checkpoints"
 
@@ -259,26 +277,70 @@ class ScanResult(Base):
 # ──── Database Engine with Connection Pooling ────
 
 
-def get_engine(database_url: str, pool_size: int = 10, max_overflow: int = 20):
+def _json_serializer(value: Any) -> str:
+    """Encode JSON columns with orjson.
+
+    Falls back to the stdlib for values orjson rejects, such as integers
+    beyond 64 bits. Reads stay on json.loads, which keeps those integers
+    exact where orjson would turn them into floats.
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except TypeError:
+        return json.dumps(value)
+
+
+# Engines created by get_engine, keyed on (url, pool_size, max_overflow).
+_engines: dict[tuple[str, int, int], Engine] = {}
+
+
+def get_engine(
+    database_url: str, pool_size: int = 10, max_overflow: int = 20
+) -> Engine:
     """Create a SQLAlchemy engine with connection pooling.
 
+    Engines are kept per argument set, so the app and every service
+    that initializes against the same URL share one connection pool.
+    dispose_engines() closes them all.
+
     Args:
         database_url: PostgreSQL connection string (or sqlite for testing).
         pool_size: Number of connections to maintain in the pool.
         max_overflow: Max connections beyond pool_size allowed temporarily.
     """
+    key = (database_url, pool_size, max_overflow)
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
     # Pool settings only apply to PostgreSQL; SQLite uses SingletonThreadPool
     if database_url.startswith("sqlite"):
-        return create_engine(database_url, echo=False)
-    return create_engine(
-        database_url,
-        pool_size=pool_size,
-        max_overflow=max_overflow,
-        pool_timeout=30,
-        pool_recycle=1800,
-        pool_pre_ping=True,
-        echo=False,
-    )
+        engine = create_engine(
+            database_url, echo=False, json_serializer=_json_serializer
+        )
+    else:
+        engine = create_engine(
+            database_url,
+            json_serializer=_json_serializer,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=30,
+            pool_recycle=1800,
+            pool_pre_ping=True,
+            echo=False,
+        )
+    return _engines.setdefault(key, engine)
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection and forget all engines.
+
+    Called at app shutdown; tests call it to release file handles
+    before removing a SQLite database.
+    """
+    engines = list(_engines.values())
+    _engines.clear()
+    for engine in engines:
+        engine.dispose()
 
 
 def get_session_factory(database_url: str, pool_size: int = 10) -> sessionmaker:
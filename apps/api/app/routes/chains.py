@@ -10,7 +10,10 @@ from fastapi.responses import HTMLResponse
 
 from ..core.dependencies import check_rate_limit, get_current_user, require_write
 from ..core.rate_limit import RateLimitResult
+from ..core.responses import ORJSONResponse, list_response
 from ..schemas.schemas import (
+    CHAIN_LIST_ADAPTER,
+    ENTRY_LIST_ADAPTER,
     ChainAlertsResponse,
     ChainCreate,
     ChainListResponse,
@@ -50,14 +53,14 @@ async def create_chain(
     return chain
 
 
-@router.get("", response_model=ChainListResponse)
+@router.get("", responses={200: {"model": ChainListResponse}})
 async def list_chains(
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """List all chains for the current user."""
     chains = chain_service.list_chains(user["id"])
-    return {"chains": chains, "total": len(chains)}
+    return list_response("chains", CHAIN_LIST_ADAPTER, chains, total=len(chains))
 
 
 @router.get("/{chain_id}", response_model=ChainResponse)
@@ -148,7 +151,7 @@ async def share_chain(
     return result
 
 
-@router.get("/{chain_id}/alerts", response_model=ChainAlertsResponse)
+@router.get("/{chain_id}/alerts", responses={200: {"model": ChainAlertsResponse}})
 async def get_chain_alerts(
     chain_id: str,
     user: dict[str, Any] = Depends(get_current_user),
@@ -178,19 +181,11 @@ async def get_chain_alerts(
             user_id=user["id"],
         )
 
-    return {
+    return ORJSONResponse({
         "chain_id": chain_id,
-        "alerts": [
-            {
-                "rule": a.rule,
-                "severity": a.severity.value,
-                "message": a.message,
-                "entry_id": a.entry_id,
-            }
-            for a in alerts
-        ],
+        "alerts": [a.to_dict() for a in alerts],
         "analyzed_at": time.time(),
-    }
+    })
 
 
 @router.get("/{chain_id}/export", response_class=HTMLResponse)
@@ -356,7 +351,7 @@ async def append_entry(
     return entry
 
 
-@router.post("/{chain_id}/entries/batch", response_model=EntryListResponse)
+@router.post("/{chain_id}/entries/batch", responses={200: {"model": EntryListResponse}})
 async def batch_append_entries(
     chain_id: str,
     body: EntryBatchCreate,
@@ -368,10 +363,10 @@ async def batch_append_entries(
     entries = chain_service.batch_append(chain_id, user["id"], entries_data)
     if not entries:
         raise HTTPException(status_code=404, detail="Chain not found")
-    return {"entries": entries, "total": len(entries)}
+    return list_response("entries", ENTRY_LIST_ADAPTER, entries, total=len(entries))
 
 
-@router.get("/{chain_id}/entries", response_model=EntryListResponse)
+@router.get("/{chain_id}/entries", responses={200: {"model": EntryListResponse}})
 async def list_entries(
     chain_id: str,
     offset: int = Query(default=0, ge=0),
@@ -384,7 +379,7 @@ async def list_entries(
     if not chain:
         raise HTTPException(status_code=404, detail="Chain not found")
     entries = chain_service.list_entries(chain_id, offset, limit)
-    return {"entries": entries, "total": len(entries)}
+    return list_response("entries", ENTRY_LIST_ADAPTER, entries, total=len(entries))
 
 
 @router.get("/{chain_id}/entries/{entry_index}", response_model=EntryResponse)
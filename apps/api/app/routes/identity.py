@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
-import html as html_mod
 import json
 import time
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 from fastapi.responses import HTMLResponse
 
 from ..core.dependencies import check_rate_limit, get_current_user, require_write
+from ..core.etag import etag_matches, make_etag, not_modified
 from ..core.rate_limit import RateLimitResult
+from ..core.responses import ORJSONResponse
 from ..schemas.schemas import (
+    IDENTITY_ID_PATTERN,
     IdentityActByAgentId,
     IdentityActRequest,
     IdentityListResponse,
@@ -20,13 +22,29 @@ from ..schemas.schemas import (
     IdentityResponse,
     IdentityVerifyResponse,
 )
-from ..services.identity_service import identity_service
+from ..services.identity_service import IdentitySnapshot, identity_service
+from ..services.receipt_html import (
+    COLOR_BAD,
+    COLOR_OK,
+    STATUS_BAD,
+    STATUS_OK,
+    escape_html,
+    receipt_cache,
+)
 
-router = APIRouter(prefix="/v1/identity", tags=["identity"])
+router = APIRouter(
+    prefix="/v1/identity",
+    tags=["identity"],
+    default_response_class=ORJSONResponse,
+)
 
 # Secondary router for /api/identity endpoints
 api_router = APIRouter(prefix="/api/identity", tags=["identity"])
 
+_receipt_cache = receipt_cache()
+
+IdentityId = Annotated[str, Path(pattern=IDENTITY_ID_PATTERN)]
+
 
 @router.post("/register", response_model=IdentityResponse)
 async def register_identity(
@@ -53,19 +71,37 @@ async def register_identity(
     return identity
 
 
-@router.get("", response_model=IdentityListResponse)
+@router.get("", responses={200: {"model": IdentityListResponse}})
 async def list_identities(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
-    """List all identities for the current user."""
-    identities = identity_service.list_identities(user["id"])
-    return {"identities": identities, "total": len(identities)}
+    """List identities for the current user, most recent first."""
+    version = identity_service.get_listing_version(user["id"])
+    etag = make_etag("identities", user["id"], version, limit, offset)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    identities = identity_service.list_identities(
+        user["id"], limit=limit, offset=offset
+    )
+    total = identity_service.get_identity_count(user["id"])
+    return {
+        "identities": identities,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
 
 
-@router.get("/{identity_id}", response_model=IdentityResponse)
+@router.get("/{identity_id}", responses={200: {"model": IdentityResponse}})
 async def get_identity(
-    identity_id: str,
+    identity_id: IdentityId,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
@@ -78,7 +114,7 @@ async def get_identity(
 
 @router.post("/{identity_id}/act")
 async def record_action(
-    identity_id: str,
+    identity_id: IdentityId,
     body: IdentityActRequest,
     user: dict[str, Any] = Depends(require_write),
     _rl: RateLimitResult = Depends(check_rate_limit),
@@ -101,7 +137,7 @@ async def record_action(
 
 @router.get("/{identity_id}/verify", response_model=IdentityVerifyResponse)
 async def verify_identity(
-    identity_id: str,
+    identity_id: IdentityId,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
@@ -114,7 +150,7 @@ async def verify_identity(
 
 @router.get("/{identity_id}/history")
 async def get_history(
-    identity_id: str,
+    identity_id: IdentityId,
     limit: int = Query(default=50, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     user: dict[str, Any] = Depends(get_current_user),
@@ -127,35 +163,23 @@ async def get_history(
     return {"actions": history, "total": len(history)}
 
 
-@router.get("/{identity_id}/receipt", response_class=HTMLResponse)
-async def get_identity_receipt(
-    identity_id: str,
-    _rl: RateLimitResult = Depends(check_rate_limit),
-):
-    """Export identity as a self-verifying HTML receipt.
+def _render_identity_receipt(identity_id: str, snap: IdentitySnapshot) -> str:
+    """Render the self-verifying HTML receipt for an identity snapshot."""
+    identity = snap.identity
+    verification = snap.verification
+    history = snap.history
 
-    Public endpoint — receipts are self-verifying documents.
-    Shows: agent name, type, address, public key, action timeline,
-    verification status.
-    """
-    identity = identity_service.get_identity(identity_id)
-    if not identity:
-        raise HTTPException(status_code=404, detail="Identity not found")
-
-    verification = identity_service.verify(identity_id)
-    history = identity_service.get_history(identity_id, limit=100)
-
-    name = html_mod.escape(identity["name"])
-    agent_type = html_mod.escape(identity.get("agent_type", "custom"))
-    public_key = html_mod.escape(identity["public_key"])
-    address = html_mod.escape(identity_id)
-    chain_id = html_mod.escape(identity["chain_id"])
+    name = escape_html(identity["name"])
+    agent_type = escape_html(identity.get("agent_type", "custom"))
+    public_key = escape_html(identity["public_key"])
+    address = escape_html(identity_id)
+    chain_id = escape_html(identity["chain_id"])
 
     verified = verification and verification.get("valid", False)
-    status_text = "VERIFIED" if verified else "BROKEN"
-    status_color = "#00dc73" if verified else "#ef4444"
+    status_text = STATUS_OK if verified else STATUS_BAD
+    status_color = COLOR_OK if verified else COLOR_BAD
     action_count = verification.get("action_count", 0) if verification else 0
-    verify_message = html_mod.escape(
+    verify_message = escape_html(
         verification.get("message", "") if verification else ""
     )
 
@@ -227,6 +251,33 @@ actions.forEach(a => {{
 </body>
 </html>"""
 
+    return html_content
+
+
+@router.get("/{identity_id}/receipt", response_class=HTMLResponse)
+async def get_identity_receipt(
+    identity_id: IdentityId,
+    _rl: RateLimitResult = Depends(check_rate_limit),
+):
+    """Export identity as a self-verifying HTML receipt.
+
+    Public endpoint — receipts are self-verifying documents.
+    Shows: agent name, type, address, public key, action timeline,
+    verification status.
+    """
+    head = identity_service.get_chain_head(identity_id)
+    if head is None:
+        raise HTTPException(status_code=404, detail="Identity not found")
+
+    cache_key = (identity_id, head)
+    html_content = _receipt_cache.get(cache_key)
+    if html_content is None:
+        snap = identity_service.render_snapshot(identity_id, history_limit=100)
+        if not snap:
+            raise HTTPException(status_code=404, detail="Identity not found")
+        html_content = _render_identity_receipt(identity_id, snap)
+        _receipt_cache.set(cache_key, html_content)
+
     return HTMLResponse(content=html_content)
 
 
@@ -2,26 +2,44 @@
 
 from __future__ import annotations
 
-import html as html_mod
 import json
 import time
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 from fastapi.responses import HTMLResponse
 
 from ..core.dependencies import check_rate_limit, get_current_user, require_write
+from ..core.etag import etag_matches, make_etag, not_modified
 from ..core.rate_limit import RateLimitResult
+from ..core.responses import ORJSONResponse
 from ..schemas.schemas import (
+    ARTIFACT_ID_PATTERN,
     ArtifactListResponse,
     ArtifactResponse,
     ProvenanceOriginRequest,
     ProvenanceTransitionRequest,
     ProvenanceVerifyResponse,
 )
-from ..services.provenance_service import provenance_service
+from ..services.provenance_service import ProvenanceSnapshot, provenance_service
+from ..services.receipt_html import (
+    COLOR_BAD,
+    COLOR_OK,
+    STATUS_BAD,
+    STATUS_OK,
+    escape_html,
+    receipt_cache,
+)
+
+router = APIRouter(
+    prefix="/v1/provenance",
+    tags=["provenance"],
+    default_response_class=ORJSONResponse,
+)
 
-router = APIRouter(prefix="/v1/provenance", tags=["provenance"])
+_receipt_cache = receipt_cache()
+
+ArtifactId = Annotated[str, Path(pattern=ARTIFACT_ID_PATTERN)]
 
 
 @router.post("/origin", response_model=ArtifactResponse)
@@ -45,19 +63,37 @@ async def register_origin(
     return artifact
 
 
-@router.get("", response_model=ArtifactListResponse)
+@router.get("", responses={200: {"model": ArtifactListResponse}})
 async def list_artifacts(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
-    """List all artifacts for the current user."""
-    artifacts = provenance_service.list_artifacts(user["id"])
-    return {"artifacts": artifacts, "total": len(artifacts)}
+    """List artifacts for the current user, most recent first."""
+    version = provenance_service.get_listing_version(user["id"])
+    etag = make_etag("artifacts", user["id"], version, limit, offset)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    artifacts = provenance_service.list_artifacts(
+        user["id"], limit=limit, offset=offset
+    )
+    total = provenance_service.get_artifact_count(user["id"])
+    return {
+        "artifacts": artifacts,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
 
 
-@router.get("/{artifact_id}", response_model=ArtifactResponse)
+@router.get("/{artifact_id}", responses={200: {"model": ArtifactResponse}})
 async def get_artifact(
-    artifact_id: str,
+    artifact_id: ArtifactId,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
@@ -70,7 +106,7 @@ async def get_artifact(
 
 @router.post("/{artifact_id}/transition")
 async def record_transition(
-    artifact_id: str,
+    artifact_id: ArtifactId,
     body: ProvenanceTransitionRequest,
     user: dict[str, Any] = Depends(require_write),
     _rl: RateLimitResult = Depends(check_rate_limit),
@@ -94,7 +130,7 @@ async def record_transition(
 
 @router.get("/{artifact_id}/verify", response_model=ProvenanceVerifyResponse)
 async def verify_provenance(
-    artifact_id: str,
+    artifact_id: ArtifactId,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
@@ -107,7 +143,7 @@ async def verify_provenance(
 
 @router.get("/{artifact_id}/history")
 async def get_history(
-    artifact_id: str,
+    artifact_id: ArtifactId,
     limit: int = Query(default=50, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     user: dict[str, Any] = Depends(get_current_user),
@@ -122,37 +158,24 @@ async def get_history(
     return {"entries": history, "total": len(history)}
 
 
-@router.get("/{artifact_id}/receipt", response_class=HTMLResponse)
-async def get_provenance_receipt(
-    artifact_id: str,
-    user: dict[str, Any] = Depends(get_current_user),
-    _rl: RateLimitResult = Depends(check_rate_limit),
-):
-    """Export provenance as a self-verifying HTML receipt.
+def _render_provenance_receipt(snap: ProvenanceSnapshot) -> str:
+    """Render the self-verifying HTML receipt for a provenance snapshot."""
+    artifact = snap.artifact
+    verification = snap.verification
+    history = snap.history
 
-    Shows: artifact name, type, creator, origin hash, modification
-    timeline (who, when, why, hash before/after), current hash,
-    verification status.
-    """
-    artifact = provenance_service.get_artifact(artifact_id, user["id"])
-    if not artifact:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
-    verification = provenance_service.verify(artifact_id)
-    history = provenance_service.get_history(artifact_id, limit=100)
-
-    name = html_mod.escape(artifact["name"])
-    content_type = html_mod.escape(artifact.get("content_type", "unknown"))
-    creator = html_mod.escape(artifact["creator"])
-    origin_hash = html_mod.escape(artifact["content_hash"])
-    current_hash = html_mod.escape(artifact["current_hash"])
-    chain_id = html_mod.escape(artifact["chain_id"])
+    name = escape_html(artifact["name"])
+    content_type = escape_html(artifact.get("content_type", "unknown"))
+    creator = escape_html(artifact["creator"])
+    origin_hash = escape_html(artifact["content_hash"])
+    current_hash = escape_html(artifact["current_hash"])
+    chain_id = escape_html(artifact["chain_id"])
 
     verified = verification and verification.get("valid", False)
-    status_text = "VERIFIED" if verified else "BROKEN"
-    status_color = "#00dc73" if verified else "#ef4444"
+    status_text = STATUS_OK if verified else STATUS_BAD
+    status_color = COLOR_OK if verified else COLOR_BAD
     transition_count = verification.get("transition_count", 0) if verification else 0
-    verify_message = html_mod.escape(
+    verify_message = escape_html(
         verification.get("message", "") if verification else ""
     )
 
@@ -248,4 +271,34 @@ if (timeline.length === 0) {{
 </body>
 </html>"""
 
+    return html_content
+
+
+@router.get("/{artifact_id}/receipt", response_class=HTMLResponse)
+async def get_provenance_receipt(
+    artifact_id: ArtifactId,
+    user: dict[str, Any] = Depends(get_current_user),
+    _rl: RateLimitResult = Depends(check_rate_limit),
+):
+    """Export provenance as a self-verifying HTML receipt.
+
+    Shows: artifact name, type, creator, origin hash, modification
+    timeline (who, when, why, hash before/after), current hash,
+    verification status.
+    """
+    head = provenance_service.get_chain_head(artifact_id, user["id"])
+    if head is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    cache_key = (artifact_id, head)
+    html_content = _receipt_cache.get(cache_key)
+    if html_content is None:
+        snap = provenance_service.render_snapshot(
+            artifact_id, user["id"], history_limit=100
+        )
+        if not snap:
+            raise HTTPException(status_code=404, detail="Artifact not found")
+        html_content = _render_provenance_receipt(snap)
+        _receipt_cache.set(cache_key, html_content)
+
     return HTMLResponse(content=html_content)
@@ -2,27 +2,58 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
 from fastapi.responses import Response
 
 from ..core.dependencies import check_rate_limit, get_current_user, require_write
+from ..core.etag import etag_matches, make_etag, not_modified
 from ..core.rate_limit import RateLimitResult
-from ..schemas.schemas import ReceiptCreate, ReceiptListResponse, ReceiptResponse
+from ..core.responses import list_response
+from ..schemas.schemas import (
+    HEX_ID_PATTERN,
+    RECEIPT_LIST_ADAPTER,
+    ReceiptCreate,
+    ReceiptListResponse,
+    ReceiptResponse,
+)
 from ..services.receipt_service import receipt_service
 
 router = APIRouter(prefix="/v1/receipts", tags=["receipts"])
 
+_BADGE_HEADERS = {"Cache-Control": "public, max-age=300"}
 
-@router.get("", response_model=ReceiptListResponse)
+ReceiptId = Annotated[str, Path(pattern=HEX_ID_PATTERN)]
+
+
+@router.get("", responses={200: {"model": ReceiptListResponse}})
 async def list_receipts(
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
-    """List all receipts for the current user."""
-    receipts = receipt_service.list_receipts(user["id"])
-    return {"receipts": receipts, "total": len(receipts)}
+    """List receipts for the current user, most recent first."""
+    version = receipt_service.get_listing_version(user["id"])
+    etag = make_etag("receipts", user["id"], version, limit, offset)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    receipts = receipt_service.list_receipts(
+        user["id"], limit=limit, offset=offset
+    )
+    total = receipt_service.get_receipt_count(user["id"])
+    return list_response(
+        "receipts",
+        RECEIPT_LIST_ADAPTER,
+        receipts,
+        headers={"ETag": etag},
+        total=total,
+        limit=limit,
+        offset=offset,
+    )
 
 
 @router.post("", response_model=ReceiptResponse)
@@ -45,7 +76,7 @@ async def create_receipt(
 
 @router.get("/{receipt_id}", response_model=ReceiptResponse)
 async def get_receipt(
-    receipt_id: str,
+    receipt_id: ReceiptId,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
@@ -58,20 +89,20 @@ async def get_receipt(
 
 @router.get("/{receipt_id}/pdf")
 async def get_receipt_pdf(
-    receipt_id: str,
+    receipt_id: ReceiptId,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """Export a receipt as PDF data."""
-    receipt = receipt_service.get_receipt_for_user(receipt_id, user["id"])
-    if not receipt:
+    pdf_data = receipt_service.get_receipt_pdf_data_for_user(receipt_id, user["id"])
+    if not pdf_data:
         raise HTTPException(status_code=404, detail="Receipt not found")
-    return receipt_service.get_receipt_pdf_data(receipt_id)
+    return pdf_data
 
 
 @router.get("/{receipt_id}/badge")
 async def get_receipt_badge(
-    receipt_id: str,
+    receipt_id: ReceiptId,
 ):
     """Get an embeddable SVG badge for a receipt. Public endpoint."""
     badge = receipt_service.get_receipt_badge(receipt_id)
@@ -80,5 +111,5 @@ async def get_receipt_badge(
     return Response(
         content=badge["svg"],
         media_type="image/svg+xml",
-        headers={"Cache-Control": "public, max-age=300"},
+        headers=_BADGE_HEADERS,
     )
@@ -2,30 +2,54 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
 import hashlib
+import importlib.util
 import io
-import json
 import logging
+import os
+import queue
 import re
+import secrets
+import tempfile
+import threading
 import time
-import uuid
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any
-
-from fastapi import APIRouter, Depends, HTTPException, Request
+from itertools import compress, islice
+from operator import itemgetter, ne
+from typing import IO, Annotated, Any
+
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import Path as PathParam
 from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import insert, select
 from sqlalchemy.orm import sessionmaker
+from xycore import XYEntry
+from xycore.crypto import compute_xy
+from xycore.signature import verify_signature
 
+from ..core.cache import TTLCache
 from ..core.dependencies import optional_user
+from ..core.etag import etag_matches, make_etag, not_modified
+from ..core.responses import ORJSONResponse
 from ..models.database import ScanResult as ScanResultModel, get_engine
+from ..schemas.schemas import HEX_ID_PATTERN
 from ..services.chain_service import chain_service
 
 logger = logging.getLogger("pruv.api.scans")
 
-router = APIRouter(prefix="/v1/scans", tags=["scans"])
+router = APIRouter(
+    prefix="/v1/scans",
+    tags=["scans"],
+    default_response_class=ORJSONResponse,
+)
 
 
 # ──── Constants ────
@@ -40,6 +64,59 @@ IGNORE_FILES = {".DS_Store", "Thumbs.db", ".gitkeep"}
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+MAX_UPLOAD_SIZE = 64 * 1024 * 1024  # 64MB — uploaded chain JSON or ZIP
+UPLOAD_READ_CHUNK = 1024 * 1024
+
+MAX_OPTIONS_SIZE = 16 * 1024  # 16KB — options is a handful of booleans
+
+# Allowance for multipart boundaries, part headers and form fields
+# when judging an upload by its Content-Length
+_MULTIPART_SLACK = MAX_OPTIONS_SIZE + 64 * 1024
+
+# A scan reports at most this many findings; a chain broken at every
+# entry would otherwise produce several findings per entry. Callers may
+# pick their own cap with the max_findings option, up to the limit.
+MAX_FINDINGS = 1000
+MAX_FINDINGS_LIMIT = 10000
+
+# Verification is offloaded to a shared thread pool so large chains
+# don't block the event loop. The checks are pure Python and hold the
+# GIL, so chunking does not make one chain verify faster; it lets a
+# stored chain's chunks start hashing while the rest is still fetched.
+VERIFY_CHUNK_SIZE = 256
+_VERIFY_POOL = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="pruv-verify",
+)
+
+# Fields of a stored entry that a scan checks; a verified prefix is
+# recorded as a running SHA-256 over these, one JSON array per entry.
+_DIGEST_FIELDS = itemgetter(
+    "index", "timestamp", "operation", "x", "y", "xy", "signature", "public_key",
+)
+
+# hashlib and zlib drop the GIL on large buffers, so ZIP members at
+# least this big are hashed on the verify pool; smaller ones are
+# cheaper inline.
+PARALLEL_HASH_MIN_SIZE = 64 * 1024
+ZIP_READ_CHUNK = 64 * 1024
+DOWNLOAD_CHUNK = 64 * 1024
+
+# Scan results never change once written, so clients and shared
+# caches may keep both GET representations indefinitely.
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Rendered scan receipts as UTF-8 bytes, keyed by scan ID
+_receipt_cache = TTLCache(maxsize=1024, ttl=3600)
+
+# Encoded GET /{scan_id} bodies of completed scans, keyed by scan ID;
+# polling clients are served from here without touching the database
+_result_cache = TTLCache(maxsize=10_000, ttl=3600)
+
+# xycore.signature needs PyNaCl or cryptography; checked once at import
+_SIG_AVAILABLE = any(
+    importlib.util.find_spec(name) is not None for name in ("nacl", "cryptography")
+)
+
 LANGUAGE_MAP: dict[str, str] = {
     ".py": "py", ".js": "js", ".ts": "ts", ".tsx": "tsx", ".jsx": "jsx",
     ".rb": "rb", ".go": "go", ".rs": "rs", ".java": "java", ".kt": "kt",
@@ -83,6 +160,14 @@ class ScanResponse(BaseModel):
     entries: list[ScanEntryResponse] = Field(default_factory=list)
     summary: str | None = None
     receipt_id: str | None = None
+    findings_truncated: bool = False
+
+
+class ScanOptions(BaseModel):
+    deep_verify: bool = True
+    check_signatures: bool = True
+    generate_receipt: bool = True
+    max_findings: int = Field(default=MAX_FINDINGS, ge=1, le=MAX_FINDINGS_LIMIT)
 
 
 class GitHubScanRequest(BaseModel):
@@ -99,66 +184,267 @@ class URLScanRequest(BaseModel):
 _session_factory: sessionmaker | None = None
 
 
-def _get_session():
+def _new_scan_id() -> str:
+    """A 12-hex-char scan ID from a single 6-byte random draw.
+
+    Random rather than sequential: scan results are readable by ID alone.
+    """
+    return secrets.token_hex(6)
+
+
+# Outbound fetches for /github and /url share one connection pool,
+# opened in the app lifespan; at most MAX_CONCURRENT_FETCHES run at once
+MAX_CONCURRENT_FETCHES = 16
+_http_client: httpx.AsyncClient | None = None
+_fetch_slots: asyncio.Semaphore | None = None
+
+
+async def open_http_client() -> None:
+    """Create the shared outbound client; called from app startup."""
+    global _http_client, _fetch_slots
+    _http_client = httpx.AsyncClient(
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_FETCHES * 2),
+    )
+    _fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+
+async def close_http_client() -> None:
+    """Close the shared outbound client; called from app shutdown."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+@contextlib.asynccontextmanager
+async def _fetch(url: str, timeout: float, headers: dict[str, str]):
+    """Stream a GET through the shared client, within the fetch limit.
+
+    Outside the app lifespan (no shared client) a one-off client is used.
+    """
+    if _http_client is None:
+        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
+            async with client.stream("GET", url, headers=headers) as resp:
+                yield resp
+        return
+    async with _fetch_slots:
+        async with _http_client.stream("GET", url, headers=headers, timeout=timeout) as resp:
+            yield resp
+
+
+def init_db(database_url: str) -> None:
+    """Bind the scan session factory; called once from app startup."""
     global _session_factory
+    engine = get_engine(database_url)
+    from ..models.database import Base
+    Base.metadata.create_all(bind=engine)
+    _session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+
+
+def _get_session():
     if _session_factory is None:
         from ..core.config import settings
-        db_url = settings.database_url or "sqlite:///pruv_dev.db"
-        engine = get_engine(db_url)
-        from ..models.database import Base
-        Base.metadata.create_all(bind=engine)
-        _session_factory = sessionmaker(
-            autocommit=False, autoflush=False, bind=engine
-        )
+        init_db(settings.effective_database_url)
     return _session_factory()
 
 
+# Built once; each batch is an executemany of this Core INSERT
+_SCAN_INSERT = insert(ScanResultModel)
+
+
+class _ScanWriter:
+    """Write-behind persistence for scan results.
+
+    Rows are queued from the request path and inserted in batches by a
+    daemon thread — one INSERT per batch instead of one commit per scan.
+    Until a row is committed it is served from memory, so a GET right
+    after the POST still finds it. A batch that still fails after its
+    retries stays in memory rather than being dropped, since its scan
+    IDs have already been returned to clients.
+    """
+
+    BATCH_SIZE = 64
+    BATCH_WINDOW = 0.05  # seconds to wait for more rows before writing
+    WRITE_ATTEMPTS = 3
+    RETRY_DELAY = 0.5  # seconds before the first retry, doubled after each
+
+    def __init__(self) -> None:
+        # None is the stop signal queued by close()
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue()
+        self._pending: dict[str, ScanResultModel] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, row: dict[str, Any]) -> None:
+        with self._lock:
+            self._pending[row["id"]] = ScanResultModel(**row)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="pruv-scan-writer", daemon=True,
+                )
+                self._thread.start()
+        self._queue.put(row)
+
+    def get(self, scan_id: str) -> ScanResultModel | None:
+        """Return a scan that is queued or could not be committed."""
+        with self._lock:
+            return self._pending.get(scan_id)
+
+    def flush(self) -> None:
+        """Block until every queued row has been handled."""
+        self._queue.join()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write every queued row, then stop and join the writer thread.
+
+        Blocks; call it off the event loop at shutdown, so an interpreter
+        exit does not take queued scans down with the daemon thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            row = self._queue.get()
+            if row is None:
+                self._queue.task_done()
+                return
+            batch = [row]
+            stop = False
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            while len(batch) < self.BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stop = True
+                    break
+                batch.append(row)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        delay = self.RETRY_DELAY
+        for attempt in range(1, self.WRITE_ATTEMPTS + 1):
+            try:
+                with _get_session() as session:
+                    session.execute(_SCAN_INSERT, batch)
+                    session.commit()
+                break
+            except Exception:
+                if attempt == self.WRITE_ATTEMPTS:
+                    logger.exception(
+                        "Failed to persist %d scan result(s); keeping them in memory",
+                        len(batch),
+                    )
+                    return
+                logger.warning(
+                    "Persisting %d scan result(s) failed, retrying", len(batch),
+                    exc_info=True,
+                )
+                time.sleep(delay)
+                delay *= 2
+        with self._lock:
+            for row in batch:
+                self._pending.pop(row["id"], None)
+
+
+scan_writer = _ScanWriter()
+
+
+# Columns the GET routes read; selected as a plain row, not an ORM object
+_SCAN_SELECT = select(
+    ScanResultModel.id,
+    ScanResultModel.status,
+    ScanResultModel.chain_id,
+    ScanResultModel.started_at,
+    ScanResultModel.completed_at,
+    ScanResultModel.findings,
+    ScanResultModel.receipt_id,
+)
+
+
+def _load_scan(scan_id: str) -> Any:
+    """Return a stored or still-queued scan, or raise 404.
+
+    Both shapes expose the same attributes (id, status, findings, ...).
+    """
+    scan = scan_writer.get(scan_id)
+    if scan is None:
+        try:
+            with _get_session() as session:
+                scan = session.execute(
+                    _SCAN_SELECT.where(ScanResultModel.id == scan_id)
+                ).one_or_none()
+        except Exception:
+            logger.exception("Failed to load scan %s", scan_id)
+            scan = None
+    if scan is None:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    return scan
+
+
 # ──── Helpers ────
 
 def _should_ignore_path(path: str) -> bool:
     """Check if a file path should be ignored."""
-    parts = Path(path).parts
-    for part in parts:
-        if part in IGNORE_DIRS:
-            return True
-    name = Path(path).name
-    if name in IGNORE_FILES:
-        return True
-    if name.startswith(".env"):
+    # ZIP member names always use "/"; a plain split avoids building a
+    # Path for every file in large archives
+    parts = path.split("/")
+    if not IGNORE_DIRS.isdisjoint(parts):
         return True
-    return False
+    name = parts[-1]
+    return name in IGNORE_FILES or name.startswith(".env")
 
 
 def _get_file_type(path: str) -> str:
     """Get file type label from extension."""
-    ext = Path(path).suffix.lower()
-    return LANGUAGE_MAP.get(ext, ext.lstrip(".") if ext else "")
+    name = path.rsplit("/", 1)[-1]
+    # Same rule as Path.suffix: no suffix for dotfiles or a trailing dot
+    dot = name.rfind(".")
+    if not 0 < dot < len(name) - 1:
+        return ""
+    return _file_type_for_suffix(name[dot:])
 
 
-def _hash_bytes(data: bytes) -> str:
-    """SHA-256 hash of bytes."""
-    return hashlib.sha256(data).hexdigest()
+@functools.lru_cache(maxsize=256)
+def _file_type_for_suffix(suffix: str) -> str:
+    """Label for a suffix as written; a repo repeats a handful of them."""
+    ext = suffix.lower()
+    return LANGUAGE_MAP.get(ext, ext[1:])
 
 
 def _build_chain_from_files(
-    files: list[tuple[str, bytes]],
+    files: list[tuple[str, str, int]],
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    """Build a chain of entries from a list of (path, content) pairs.
+    """Build a chain of entries from a list of (path, sha256, size) triples.
 
     Returns (entries, findings).
     Each file becomes an entry. Chain rule: entry[N].x == entry[N-1].y
     """
-    from xycore.crypto import compute_xy
-
     entries: list[dict[str, Any]] = []
     findings: list[dict[str, Any]] = []
 
     prev_y = "GENESIS"
+    # The files are one snapshot, so every entry carries the build time
+    ts = time.time()
 
-    for i, (path, content) in enumerate(files):
+    for i, (path, y, size) in enumerate(files):
         x = prev_y
-        y = _hash_bytes(content)
-        ts = time.time()
         operation = path
         xy = compute_xy(x, operation, y, ts)
 
@@ -171,7 +457,7 @@ def _build_chain_from_files(
             "xy": xy,
             "path": path,
             "file_type": _get_file_type(path),
-            "size": len(content),
+            "size": size,
             "verified": True,
         }
         entries.append(entry)
@@ -186,27 +472,33 @@ def _build_chain_from_files(
                 "entry_index": i,
             })
 
-        # Recompute and verify xy
-        expected_xy = compute_xy(x, operation, y, ts)
-        if xy != expected_xy:
-            entry["verified"] = False
-            findings.append({
-                "severity": "critical",
-                "type": "proof_mismatch",
-                "message": f"Entry #{i} ({path}) xy proof mismatch",
-                "entry_index": i,
-            })
-
         prev_y = y
 
     return entries, findings
 
 
-def _extract_zip_files(zip_bytes: bytes) -> list[tuple[str, bytes]]:
-    """Extract files from a ZIP, returning (path, content) pairs."""
-    files: list[tuple[str, bytes]] = []
+def _hash_zip_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> str:
+    """SHA-256 of a ZIP member, fed from the decompressor in chunks."""
+    h = hashlib.sha256()
+    with zf.open(info) as fp:
+        while chunk := fp.read(ZIP_READ_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
 
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+
+def _extract_zip_files(archive: bytes | IO[bytes]) -> list[tuple[str, str, int]]:
+    """Hash the files in a ZIP, returning (path, sha256, size) triples.
+
+    ``archive`` is the ZIP's bytes or a seekable file holding it.
+    Members are streamed into the hash rather than read whole. Large
+    ones are hashed on the verify pool while small ones run inline.
+    """
+    if isinstance(archive, (bytes, bytearray)):
+        archive = io.BytesIO(archive)
+    members: list[tuple[str, zipfile.ZipInfo, Future | None]] = []
+    files: list[tuple[str, str, int]] = []
+
+    with zipfile.ZipFile(archive) as zf:
         for info in sorted(zf.infolist(), key=lambda x: x.filename):
             # Skip directories
             if info.is_dir():
@@ -228,134 +520,390 @@ def _extract_zip_files(zip_bytes: bytes) -> list[tuple[str, bytes]]:
             if info.file_size > MAX_FILE_SIZE:
                 continue
 
+            future = (
+                _VERIFY_POOL.submit(_hash_zip_member, zf, info)
+                if info.file_size >= PARALLEL_HASH_MIN_SIZE else None
+            )
+            members.append((path, info, future))
+
+        for path, info, future in members:
             try:
-                content = zf.read(info)
-                files.append((path, content))
+                y = future.result() if future else _hash_zip_member(zf, info)
             except Exception:
                 continue
+            files.append((path, y, info.file_size))
 
     return files
 
 
 def _entries_to_response(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Convert internal entries to response format."""
-    return [
-        {
-            "path": e.get("path", e.get("operation", f"entry-{e['index']}")),
+    """Convert internal entries to response format.
+
+    Uploaded entries may omit ``index``; their position stands in, as in
+    the receipt.
+    """
+    response: list[dict[str, Any]] = []
+    append = response.append
+    for i, e in enumerate(entries):
+        get = e.get
+        index = get("index", i)
+        append({
+            "path": get("path") or get("operation") or f"entry-{index}",
             "hash": e["y"],
-            "index": e["index"],
-            "verified": e.get("verified", True),
-            "file_type": e.get("file_type", ""),
-            "size": e.get("size", 0),
-        }
-        for e in entries
-    ]
+            "index": index,
+            "verified": get("verified", True),
+            "file_type": get("file_type", ""),
+            "size": get("size", 0),
+        })
+    return response
+
+
+def _findings_to_response(findings: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Fill in the ``details`` default the response schema declares."""
+    return [f if "details" in f else {**f, "details": {}} for f in findings]
+
+
+def _format_timestamp(dt: datetime) -> str:
+    """Format a UTC datetime as ``YYYY-MM-DDTHH:MM:SSZ``.
+
+    Stored rows come back naive and fresh ones are tz-aware; both are UTC.
+    isoformat is a C fast path, unlike strftime's format parsing.
+    """
+    return dt.replace(tzinfo=None).isoformat(timespec="seconds") + "Z"
 
 
 def _make_summary(entries: list[dict[str, Any]], findings: list[dict[str, Any]]) -> str:
     """Generate human-readable summary."""
     total = len(entries)
-    broken = len([f for f in findings if f["severity"] == "critical"])
+    broken = sum(1 for f in findings if f["severity"] == "critical")
     if broken == 0:
         return f"{total} files scanned · all verified"
     return f"{total} files scanned · {broken} integrity failure{'s' if broken != 1 else ''}"
 
 
+@functools.lru_cache(maxsize=65536, typed=True)
+def _expected_xy(x: str, operation: str, y: str, timestamp: float) -> str:
+    """compute_xy, memoized so re-scans of a chain only hash new entries.
+
+    typed=True because 1, 1.0 and True are equal keys but compute_xy
+    formats them differently.
+    """
+    return compute_xy(x, operation, y, timestamp)
+
+
+def _verify_signature_batch(
+    pending: list[tuple[int, str, str, str, str, str, str]],
+) -> list[bool] | None:
+    """Verify the Ed25519 signatures of a batch of entries.
+
+    ``pending`` holds (index, signature, public_key, x, operation, y, xy)
+    tuples. Returns one result per tuple, in order, or None when no
+    Ed25519 backend is installed. Tuples that repeat an already-checked
+    signature and message reuse its result.
+    """
+    if not _SIG_AVAILABLE:
+        return None
+
+    results: list[bool] = []
+    seen: dict[tuple[str, str, str, str, str, str], bool] = {}
+    for i, *fields in pending:
+        key = tuple(fields)
+        ok = seen.get(key)
+        if ok is None:
+            sig, pub_key, x, operation, y, xy = key
+            # Only the signed fields (x, operation, y, xy) are read
+            xy_entry = XYEntry(
+                index=i, timestamp=0, operation=operation, x=x, y=y, xy=xy,
+                signature=sig, public_key=pub_key,
+            )
+            try:
+                ok = verify_signature(xy_entry)
+            except ImportError:
+                return None
+            seen[key] = ok
+        results.append(ok)
+    return results
+
+
 def _verify_entries(
     entries: list[dict[str, Any]],
     deep_verify: bool = True,
     check_signatures: bool = False,
+    start: int = 0,
+    stop: int | None = None,
+    first_index: int = 0,
+    max_findings: int = MAX_FINDINGS,
 ) -> list[dict[str, Any]]:
-    """Walk entries and produce findings."""
-    from xycore.crypto import compute_xy
-
+    """Walk entries[start:stop] and produce findings.
+
+    Indices in findings are relative to the full list, offset by
+    ``first_index`` when the list is the tail of a longer chain. The
+    chain rule for ``start`` is checked against ``entries[start - 1]``,
+    so disjoint slices can be verified independently. Checks stop once
+    more than ``max_findings`` have been found; callers trim the result
+    with _cap_findings.
+    """
     findings: list[dict[str, Any]] = []
-
-    for i, entry in enumerate(entries):
-        x = entry.get("x", "")
-        y = entry.get("y", "")
-        xy = entry.get("xy", entry.get("xy_proof", ""))
-        operation = entry.get("operation", entry.get("action", ""))
-        timestamp = entry.get("timestamp", 0)
-
-        # Chain rule
-        if i == 0:
-            if x != "GENESIS":
-                findings.append({
-                    "severity": "critical",
-                    "type": "chain_rule_violation",
-                    "message": f"First entry x is '{x}', expected 'GENESIS'",
-                    "entry_index": i,
-                })
-        else:
-            prev_y = entries[i - 1].get("y", "")
-            if x != prev_y:
-                findings.append({
-                    "severity": "critical",
-                    "type": "chain_break",
-                    "message": f"Entry #{i} x does not match previous entry y — chain is broken",
-                    "entry_index": i,
-                })
-
-        # Proof verification
-        if deep_verify and xy and operation:
-            expected_xy = compute_xy(x, operation, y, timestamp)
+    pending: list[tuple[int, str, str, str, str, str, str]] = []
+    # Bound once: this loop runs per entry on chains of thousands.
+    add = findings.append
+
+    stop = len(entries) if stop is None else min(stop, len(entries))
+    window = entries[start:stop]
+    # Pull each field out once into parallel lists, so the loop below
+    # indexes plain lists instead of probing every entry dict. A
+    # chain-rule-only scan needs just x and y.
+    xs = [e.get("x", "") for e in window]
+    ys = [e.get("y", "") for e in window]
+    if deep_verify or check_signatures:
+        xys = [e.get("xy") or e.get("xy_proof") or "" for e in window]
+        ops = [e.get("operation") or e.get("action") or "" for e in window]
+    if deep_verify:
+        tss = [e.get("timestamp", 0) for e in window]
+    prev_ys = [entries[start - 1].get("y", "") if start else ""] + ys[:-1]
+
+    base = first_index + start
+    # Chain rule: entry[i].x == entry[i-1].y, compared pairwise by
+    # map/compress rather than a Python-level branch per entry
+    first = 0
+    if base == 0 and window:
+        first = 1
+        if xs[0] != "GENESIS":
+            add({
+                "severity": "critical",
+                "type": "chain_rule_violation",
+                "message": f"First entry x is '{xs[0]}', expected 'GENESIS'",
+                "entry_index": 0,
+            })
+    breaks = compress(
+        range(base + first, base + len(window)),
+        map(ne, islice(xs, first, None), islice(prev_ys, first, None)),
+    )
+    for i in islice(breaks, max_findings + 1 - len(findings)):
+        add({
+            "severity": "critical",
+            "type": "chain_break",
+            "message": f"Entry #{i} x does not match previous entry y — chain is broken",
+            "entry_index": i,
+        })
+
+    # Proof verification
+    if deep_verify and len(findings) <= max_findings:
+        for k in range(len(window)):
+            xy = xys[k]
+            operation = ops[k]
+            if not (xy and operation):
+                continue
+            try:
+                expected_xy = _expected_xy(xs[k], operation, ys[k], tss[k])
+            except TypeError:
+                # Unhashable field in an uploaded entry — hash it uncached
+                expected_xy = _expected_xy.__wrapped__(xs[k], operation, ys[k], tss[k])
             if xy != expected_xy:
-                findings.append({
+                i = base + k
+                add({
                     "severity": "critical",
                     "type": "proof_mismatch",
                     "message": f"Entry #{i} xy proof does not match recomputed hash",
                     "entry_index": i,
                 })
+                if len(findings) > max_findings:
+                    break
+
+    # Signature verification — only signed entries are visited, and the
+    # ones with a key are verified in one batch below
+    signed = (
+        [k for k, e in enumerate(window) if e.get("signature")]
+        if check_signatures and len(findings) <= max_findings else []
+    )
+    for k in signed:
+        entry = window[k]
+        i = base + k
+        pub_key = entry.get("public_key")
+        if pub_key:
+            pending.append((i, entry["signature"], pub_key, xs[k], ops[k], ys[k], xys[k]))
+        else:
+            add({
+                "severity": "warning",
+                "type": "signature_missing_key",
+                "message": f"Entry #{i} has a signature but no public key",
+                "entry_index": i,
+            })
 
-        # Signature verification
-        if check_signatures:
-            sig = entry.get("signature")
-            pub_key = entry.get("public_key")
-
-            if sig and pub_key:
-                try:
-                    from xycore import XYEntry as XYE
-                    from xycore.signature import verify_signature
-
-                    xy_entry = XYE(
-                        index=entry.get("index", i),
-                        timestamp=timestamp,
-                        operation=operation,
-                        x=x,
-                        y=y,
-                        xy=xy,
-                        status=entry.get("status", "success"),
-                    )
-                    xy_entry.signature = sig
-                    xy_entry.public_key = pub_key
-                    xy_entry.signer_id = entry.get("signer_id")
-
-                    if not verify_signature(xy_entry):
-                        findings.append({
-                            "severity": "critical",
-                            "type": "signature_invalid",
-                            "message": f"Entry #{i} has an invalid Ed25519 signature",
-                            "entry_index": i,
-                        })
-                except ImportError:
-                    findings.append({
-                        "severity": "warning",
-                        "type": "signature_check_unavailable",
-                        "message": f"Entry #{i} has a signature but Ed25519 library is not installed",
-                        "entry_index": i,
-                    })
-            elif sig and not pub_key:
+    if pending:
+        results = _verify_signature_batch(pending)
+        if results is None:
+            for i, *_ in pending:
                 findings.append({
                     "severity": "warning",
-                    "type": "signature_missing_key",
-                    "message": f"Entry #{i} has a signature but no public key",
+                    "type": "signature_check_unavailable",
+                    "message": f"Entry #{i} has a signature but Ed25519 library is not installed",
                     "entry_index": i,
                 })
+        else:
+            for (i, *_), ok in zip(pending, results):
+                if not ok:
+                    findings.append({
+                        "severity": "critical",
+                        "type": "signature_invalid",
+                        "message": f"Entry #{i} has an invalid Ed25519 signature",
+                        "entry_index": i,
+                    })
+
+    # Each check runs as its own pass; a stable sort restores the
+    # per-entry order (chain rule, proof, signature) of a single walk
+    findings.sort(key=itemgetter("entry_index"))
+
+    return findings
+
 
+def _cap_findings(
+    findings: list[dict[str, Any]], max_findings: int = MAX_FINDINGS,
+) -> list[dict[str, Any]]:
+    """Trim findings to ``max_findings``, noting the cut in a final finding."""
+    if len(findings) <= max_findings:
+        return findings
+    del findings[max_findings:]
+    findings.append({
+        "severity": "info",
+        "type": "truncated",
+        "message": f"Stopped after {max_findings} findings",
+    })
     return findings
 
 
+def _is_truncated(findings: list[dict[str, Any]]) -> bool:
+    """Whether _cap_findings cut ``findings`` short."""
+    return bool(findings) and findings[-1].get("type") == "truncated"
+
+
+async def _verify_entries_async(
+    entries: list[dict[str, Any]],
+    deep_verify: bool = True,
+    check_signatures: bool = False,
+    start: int = 0,
+    first_index: int = 0,
+    max_findings: int = MAX_FINDINGS,
+) -> list[dict[str, Any]]:
+    """Verify entries off the event loop, in chunks on the verify pool."""
+    loop = asyncio.get_running_loop()
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(
+            _VERIFY_POOL, _verify_entries, entries, deep_verify,
+            check_signatures, lo, lo + VERIFY_CHUNK_SIZE, first_index, max_findings,
+        )
+        for lo in range(start, len(entries), VERIFY_CHUNK_SIZE)
+    ))
+    return _cap_findings([finding for part in parts for finding in part], max_findings)
+
+
+def _submit_chunk(
+    entries: list[dict[str, Any]],
+    lo: int,
+    hi: int,
+    deep_verify: bool,
+    check_signatures: bool,
+    first_index: int = 0,
+    max_findings: int = MAX_FINDINGS,
+) -> Future:
+    """Queue entries[lo:hi] on the verify pool as a list of its own.
+
+    The chunk is copied out, together with the entry before it that seeds
+    the chain rule, so the worker never reads a list the caller is still
+    appending to.
+    """
+    start = 1 if lo else 0
+    chunk = entries[lo - start:hi]
+    return _VERIFY_POOL.submit(
+        _verify_entries, chunk, deep_verify, check_signatures,
+        start, None, first_index + lo - start, max_findings,
+    )
+
+
+def _fetch_and_dispatch(
+    chain_id: str,
+    deep_verify: bool,
+    check_signatures: bool,
+    prefix: dict[str, Any] | None,
+    max_findings: int = MAX_FINDINGS,
+) -> tuple[list[dict[str, Any]], list[Future], str]:
+    """Stream a stored chain from the database into the verify pool.
+
+    Each full chunk is submitted as soon as its rows have been read, so
+    hashing overlaps the rest of the fetch. Every entry is also folded
+    into a running digest of the fields a scan checks, returned with the
+    entries. With a ``prefix``, entries up to the recorded boundary are
+    held back until the digest at the boundary can be compared with the
+    one recorded by that clean scan. They are skipped only if it matches,
+    so an edit anywhere in the prefix sends the whole chain through
+    verification.
+    """
+    rows = chain_service.iter_entries(chain_id, offset=0, limit=10000)
+    entries: list[dict[str, Any]] = []
+    futures: list[Future] = []
+    digest = hashlib.sha256()
+    held = prefix["index"] + 1 if prefix else 0
+    lo = 0
+    for entry in rows:
+        entries.append(entry)
+        digest.update(orjson.dumps(_DIGEST_FIELDS(entry)))
+        if held:
+            if len(entries) < held:
+                continue
+            if digest.hexdigest() == prefix["digest"]:
+                lo = held
+            held = 0
+        if len(entries) - lo == VERIFY_CHUNK_SIZE:
+            futures.append(_submit_chunk(
+                entries, lo, len(entries), deep_verify, check_signatures,
+                max_findings=max_findings,
+            ))
+            lo = len(entries)
+    # A chain now shorter than its recorded prefix is verified in full
+    for lo in range(lo, len(entries), VERIFY_CHUNK_SIZE):
+        futures.append(_submit_chunk(
+            entries, lo, lo + VERIFY_CHUNK_SIZE, deep_verify, check_signatures,
+            max_findings=max_findings,
+        ))
+    return entries, futures, digest.hexdigest()
+
+
+async def _scan_stored_chain(
+    chain_id: str,
+    user_id: str | None,
+    deep_verify: bool,
+    check_signatures: bool,
+    force: bool = False,
+    max_findings: int = MAX_FINDINGS,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Verify a stored chain and return (entries, findings).
+
+    Raises 404 if the chain is missing or not the user's. ``entries`` is
+    always the whole chain. If an earlier clean scan recorded a verified
+    prefix whose digest still matches, only entries after it are checked;
+    ``force`` re-verifies the whole chain regardless.
+
+    A prefix is recorded only after a pass with no findings that ran both
+    the proof and signature checks: a later scan trusts the prefix for
+    every check it may ask for, so a lighter pass cannot vouch for it.
+    """
+    found, prefix = chain_service.get_scan_target(chain_id, user_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Chain not found")
+    if force or (prefix and not prefix["digest"]):
+        prefix = None
+    entries, futures, digest = await asyncio.to_thread(
+        _fetch_and_dispatch, chain_id, deep_verify, check_signatures, prefix,
+        max_findings,
+    )
+    parts = await asyncio.gather(*map(asyncio.wrap_future, futures))
+    findings = _cap_findings([finding for part in parts for finding in part], max_findings)
+
+    if entries and not findings and deep_verify and check_signatures:
+        chain_service.record_verified_prefix(chain_id, entries[-1], digest)
+    return entries, findings
+
+
 def _make_result(
     scan_id: str,
     chain_id: str | None,
@@ -378,35 +926,113 @@ def _make_result(
         "status": "completed",
         "chain_id": chain_id,
         "source": source,
-        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started_at)),
-        "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(completed_at)),
-        "findings": findings,
+        "started_at": _format_timestamp(started_dt),
+        "completed_at": _format_timestamp(completed_dt),
+        "findings": _findings_to_response(findings),
         "entries": entry_responses,
         "summary": summary,
         "receipt_id": receipt_id,
+        "findings_truncated": _is_truncated(findings),
     }
 
-    # Persist to database
-    try:
-        with _get_session() as session:
-            scan_row = ScanResultModel(
-                id=scan_id,
-                user_id=user_id,
-                status="completed",
-                chain_id=chain_id,
-                started_at=started_dt,
-                completed_at=completed_dt,
-                findings=findings,
-                receipt_id=receipt_id,
-            )
-            session.add(scan_row)
-            session.commit()
-    except Exception:
-        logger.exception("Failed to persist scan result %s", scan_id)
+    # Persist to database (batched, off the request path)
+    scan_writer.submit({
+        "id": scan_id,
+        "user_id": user_id,
+        "status": "completed",
+        "chain_id": chain_id,
+        "started_at": started_dt,
+        "completed_at": completed_dt,
+        "findings": findings,
+        "receipt_id": receipt_id,
+    })
 
     return result
 
 
+def _check_content_length(request: Request) -> None:
+    """Reject a request whose declared body cannot hold an acceptable upload."""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_UPLOAD_SIZE + _MULTIPART_SLACK:
+        raise HTTPException(status_code=413, detail="File too large")
+
+
+async def _read_upload(file: Any) -> bytes:
+    """Read an uploaded file in chunks, failing with 413 past MAX_UPLOAD_SIZE."""
+    if getattr(file, "size", None) and file.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+    chunks: list[bytes] = []
+    total = 0
+    while chunk := await file.read(UPLOAD_READ_CHUNK):
+        total += len(chunk)
+        if total > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail="File too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _spooled_upload(file: Any) -> IO[bytes]:
+    """The upload's spooled file, rewound, failing with 413 past MAX_UPLOAD_SIZE.
+
+    Starlette has already spooled the part (to disk past 1MB), so an
+    archive can be read from there instead of being copied into memory.
+    """
+    fp = file.file
+    if fp.seek(0, io.SEEK_END) > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+    fp.seek(0)
+    return fp
+
+
+async def _spool_response(resp: Any) -> IO[bytes]:
+    """Copy a streamed httpx response body into an anonymous temp file."""
+    tmp = tempfile.TemporaryFile()
+    try:
+        async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK):
+            tmp.write(chunk)
+    except BaseException:
+        tmp.close()
+        raise
+    tmp.seek(0)
+    return tmp
+
+
+def _scan_options(opts: Any) -> ScanOptions:
+    """Validate a scan's ``options`` object, or 422 on bad values.
+
+    Anything other than a JSON object falls back to the defaults.
+    """
+    if not isinstance(opts, dict):
+        return ScanOptions()
+    try:
+        return ScanOptions.model_validate(opts)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False))
+
+
+def _parse_form_options(options_field: Any) -> ScanOptions:
+    """Parse the multipart ``options`` field.
+
+    A missing or malformed field falls back to the defaults; an oversized
+    one is rejected before any JSON decoding.
+    """
+    if not options_field or not isinstance(options_field, str):
+        return ScanOptions()
+    if len(options_field) > MAX_OPTIONS_SIZE:
+        raise HTTPException(status_code=413, detail="options field too large")
+    try:
+        opts = orjson.loads(options_field)
+    except orjson.JSONDecodeError:
+        return ScanOptions()
+    return _scan_options(opts)
+
+
+_GIT_SUFFIX = re.compile(r"\.git$")
+_URL_SCHEME = re.compile(r"^https?://")
+_GITHUB_HOST = re.compile(r"^github\.com/")
+_GITHUB_REPO_URL = re.compile(r"^(?:https?://)?github\.com/[\w.-]+/[\w.-]+")
+
+
 def _parse_github_url(url: str) -> tuple[str, str, str]:
     """Parse a GitHub URL into (owner, repo, branch).
 
@@ -417,9 +1043,9 @@ def _parse_github_url(url: str) -> tuple[str, str, str]:
     - https://github.com/user/repo/tree/main
     """
     url = url.strip().rstrip("/")
-    url = re.sub(r"\.git$", "", url)
-    url = re.sub(r"^https?://", "", url)
-    url = re.sub(r"^github\.com/", "", url)
+    url = _GIT_SUFFIX.sub("", url)
+    url = _URL_SCHEME.sub("", url)
+    url = _GITHUB_HOST.sub("", url)
 
     parts = url.split("/")
     if len(parts) < 2:
@@ -438,44 +1064,43 @@ def _parse_github_url(url: str) -> tuple[str, str, str]:
 
 # ──── Routes ────
 
+ScanId = Annotated[str, PathParam(pattern=HEX_ID_PATTERN)]
+
 
-@router.post("", response_model=ScanResponse)
+@router.post("", responses={200: {"model": ScanResponse}})
 async def trigger_scan(
     request: Request,
+    force: bool = False,
     user: dict[str, Any] | None = Depends(optional_user),
 ):
-    """Trigger a scan by chain ID or uploaded JSON file."""
-    scan_id = uuid.uuid4().hex[:12]
+    """Trigger a scan by chain ID or uploaded JSON file.
+
+    Stored chains are verified incrementally from the last clean scan;
+    pass ``?force=1`` to re-verify every entry.
+    """
+    scan_id = _new_scan_id()
     started_at = time.time()
     content_type = request.headers.get("content-type", "")
 
     # ── FormData path (file upload) ──
     if "multipart/form-data" in content_type:
+        _check_content_length(request)
         form = await request.form()
         file = form.get("file")
         chain_id_field = form.get("chain_id")
-        options_field = form.get("options")
+        if not file and not chain_id_field:
+            raise HTTPException(status_code=400, detail="Provide chain_id or upload a file")
 
-        deep_verify = True
-        check_signatures = True
-        generate_receipt = True
-        if options_field:
-            try:
-                opts = json.loads(str(options_field))
-                deep_verify = opts.get("deep_verify", True)
-                check_signatures = opts.get("check_signatures", True)
-                generate_receipt = opts.get("generate_receipt", True)
-            except (json.JSONDecodeError, TypeError):
-                pass
+        options = _parse_form_options(form.get("options"))
 
         if file:
-            content = await file.read()
+            content = await _read_upload(file)
             try:
-                file_data = json.loads(content)
-            except (json.JSONDecodeError, UnicodeDecodeError):
+                file_data = orjson.loads(content)
+            except orjson.JSONDecodeError:
                 raise HTTPException(status_code=400, detail="Invalid JSON file")
 
-            chain_id = file_data.get("chain_id", file_data.get("id", "uploaded"))
+            chain_id = file_data.get("chain_id") or file_data.get("id") or "uploaded"
             entries = file_data.get("entries", [])
 
             if not entries:
@@ -487,49 +1112,41 @@ async def trigger_scan(
                 return _make_result(scan_id, chain_id, findings, started_at,
                                     user_id=user["id"] if user else None, source="json_upload")
             else:
-                findings = _verify_entries(
+                findings = await _verify_entries_async(
                     entries,
-                    deep_verify=deep_verify,
-                    check_signatures=check_signatures,
+                    deep_verify=options.deep_verify,
+                    check_signatures=options.check_signatures,
+                    max_findings=options.max_findings,
                 )
 
             return _make_result(scan_id, chain_id, findings, started_at,
                                 user_id=user["id"] if user else None, entries=entries, source="json_upload")
 
         # FormData with chain_id but no file
-        if chain_id_field:
-            chain_id = str(chain_id_field)
-            user_id = user["id"] if user else None
-            chain = chain_service.get_chain(chain_id, user_id)
-            if not chain:
-                raise HTTPException(status_code=404, detail="Chain not found")
-
-            entries = chain_service.list_entries(chain_id, offset=0, limit=10000)
-            findings = _verify_entries(
-                entries,
-                deep_verify=deep_verify,
-                check_signatures=check_signatures,
-            )
-
-            receipt_id = None
-            if generate_receipt and len(entries) > 0:
-                try:
-                    from ..services.receipt_service import receipt_service
-                    receipt = receipt_service.create_receipt(
-                        chain_id=chain_id, user_id=user["id"] if user else "anonymous", task="scan-verification",
-                    )
-                    receipt_id = receipt.get("id")
-                except Exception:
-                    pass
+        chain_id = str(chain_id_field)
+        user_id = user["id"] if user else None
+        entries, findings = await _scan_stored_chain(
+            chain_id, user_id, options.deep_verify, options.check_signatures, force,
+            options.max_findings,
+        )
 
-            return _make_result(scan_id, chain_id, findings, started_at, receipt_id,
-                                user_id=user["id"] if user else None, source="chain_id")
+        receipt_id = None
+        if options.generate_receipt and len(entries) > 0:
+            try:
+                from ..services.receipt_service import receipt_service
+                receipt = receipt_service.create_receipt(
+                    chain_id=chain_id, user_id=user["id"] if user else "anonymous", task="scan-verification",
+                )
+                receipt_id = receipt.get("id")
+            except Exception:
+                pass
 
-        raise HTTPException(status_code=400, detail="Provide chain_id or upload a file")
+        return _make_result(scan_id, chain_id, findings, started_at, receipt_id,
+                            user_id=user["id"] if user else None, source="chain_id")
 
     # ── JSON body path ──
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON body")
 
@@ -537,25 +1154,16 @@ async def trigger_scan(
     if not chain_id:
         raise HTTPException(status_code=400, detail="Provide chain_id or upload a file")
 
-    opts = body.get("options", {})
-    deep_verify = opts.get("deep_verify", True)
-    check_signatures = opts.get("check_signatures", True)
-    generate_receipt = opts.get("generate_receipt", True)
+    options = _scan_options(body.get("options"))
 
     user_id = user["id"] if user else None
-    chain = chain_service.get_chain(chain_id, user_id)
-    if not chain:
-        raise HTTPException(status_code=404, detail="Chain not found")
-
-    entries = chain_service.list_entries(chain_id, offset=0, limit=10000)
-    findings = _verify_entries(
-        entries,
-        deep_verify=deep_verify,
-        check_signatures=check_signatures,
+    entries, findings = await _scan_stored_chain(
+        chain_id, user_id, options.deep_verify, options.check_signatures, force,
+        options.max_findings,
     )
 
     receipt_id = None
-    if generate_receipt and len(entries) > 0:
+    if options.generate_receipt and len(entries) > 0:
         try:
             from ..services.receipt_service import receipt_service
             receipt = receipt_service.create_receipt(
@@ -569,27 +1177,28 @@ async def trigger_scan(
                         user_id=user_id, source="chain_id")
 
 
-@router.post("/upload", response_model=ScanResponse)
+@router.post("/upload", responses={200: {"model": ScanResponse}})
 async def scan_zip_upload(
     request: Request,
     user: dict[str, Any] | None = Depends(optional_user),
 ):
     """Scan a ZIP file: extract, hash every file, build chain, verify."""
-    scan_id = uuid.uuid4().hex[:12]
+    scan_id = _new_scan_id()
     started_at = time.time()
 
+    _check_content_length(request)
     form = await request.form()
     file = form.get("file")
     if not file:
         raise HTTPException(status_code=400, detail="No file uploaded")
 
-    content = await file.read()
+    archive = _spooled_upload(file)
 
     # Verify it's actually a ZIP
-    if not zipfile.is_zipfile(io.BytesIO(content)):
+    if not zipfile.is_zipfile(archive):
         raise HTTPException(status_code=400, detail="Uploaded file is not a valid ZIP")
 
-    files = _extract_zip_files(content)
+    files = _extract_zip_files(archive)
     if not files:
         findings = [{"severity": "info", "type": "empty_archive", "message": "No scannable files found in ZIP"}]
         return _make_result(scan_id, None, findings, started_at, user_id=user["id"] if user else None, source="zip_upload")
@@ -599,15 +1208,13 @@ async def scan_zip_upload(
                         user_id=user["id"] if user else None, entries=entries, source="zip_upload")
 
 
-@router.post("/github", response_model=ScanResponse)
+@router.post("/github", responses={200: {"model": ScanResponse}})
 async def scan_github_repo(
     body: GitHubScanRequest,
     user: dict[str, Any] | None = Depends(optional_user),
 ):
     """Scan a public GitHub repo: download zipball, extract, hash, build chain, verify."""
-    import httpx
-
-    scan_id = uuid.uuid4().hex[:12]
+    scan_id = _new_scan_id()
     started_at = time.time()
 
     try:
@@ -620,17 +1227,18 @@ async def scan_github_repo(
 
     zip_url = f"https://api.github.com/repos/{owner}/{repo}/zipball/{branch}"
 
+    # The zipball is spooled to a temp file, so only the member being
+    # hashed is ever held in memory
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
-            resp = await client.get(zip_url, headers={
-                "Accept": "application/vnd.github+json",
-                "User-Agent": "pruv-scanner/1.0",
-            })
+        async with _fetch(zip_url, 60.0, headers={
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "pruv-scanner/1.0",
+        }) as resp:
             if resp.status_code == 404:
                 raise HTTPException(status_code=404, detail=f"Repository {owner}/{repo} not found or not public")
             if resp.status_code != 200:
                 raise HTTPException(status_code=502, detail=f"GitHub returned status {resp.status_code}")
-            zip_bytes = resp.content
+            archive = await _spool_response(resp)
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Timeout downloading repository from GitHub")
     except HTTPException:
@@ -638,10 +1246,11 @@ async def scan_github_repo(
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to download repository: {str(e)}")
 
-    if not zipfile.is_zipfile(io.BytesIO(zip_bytes)):
-        raise HTTPException(status_code=502, detail="GitHub did not return a valid ZIP file")
+    with archive:
+        if not zipfile.is_zipfile(archive):
+            raise HTTPException(status_code=502, detail="GitHub did not return a valid ZIP file")
+        files = _extract_zip_files(archive)
 
-    files = _extract_zip_files(zip_bytes)
     if not files:
         findings = [{"severity": "info", "type": "empty_repo", "message": "No scannable files found in repository"}]
         return _make_result(scan_id, None, findings, started_at,
@@ -653,15 +1262,13 @@ async def scan_github_repo(
                         source=f"github:{owner}/{repo}@{branch}")
 
 
-@router.post("/url", response_model=ScanResponse)
+@router.post("/url", responses={200: {"model": ScanResponse}})
 async def scan_url(
     body: URLScanRequest,
     user: dict[str, Any] | None = Depends(optional_user),
 ):
     """Scan any URL: fetch content, hash it, create a single-entry chain."""
-    import httpx
-
-    scan_id = uuid.uuid4().hex[:12]
+    scan_id = _new_scan_id()
     started_at = time.time()
 
     url = body.url.strip()
@@ -669,7 +1276,7 @@ async def scan_url(
         raise HTTPException(status_code=400, detail="URL is required")
 
     # Redirect GitHub URLs to the github flow
-    github_match = re.match(r"^(?:https?://)?github\.com/[\w.-]+/[\w.-]+", url)
+    github_match = _GITHUB_REPO_URL.match(url)
     if github_match:
         try:
             owner, repo, branch = _parse_github_url(url)
@@ -677,16 +1284,16 @@ async def scan_url(
             pass
         else:
             # Re-route through the github endpoint logic
-            import httpx as _httpx
             zip_url = f"https://api.github.com/repos/{owner}/{repo}/zipball/{branch}"
             try:
-                async with _httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
-                    resp = await client.get(zip_url, headers={
-                        "Accept": "application/vnd.github+json",
-                        "User-Agent": "pruv-scanner/1.0",
-                    })
-                    if resp.status_code == 200 and zipfile.is_zipfile(io.BytesIO(resp.content)):
-                        files = _extract_zip_files(resp.content)
+                async with _fetch(zip_url, 60.0, headers={
+                    "Accept": "application/vnd.github+json",
+                    "User-Agent": "pruv-scanner/1.0",
+                }) as resp:
+                    archive = await _spool_response(resp) if resp.status_code == 200 else None
+                if archive is not None:
+                    with archive:
+                        files = _extract_zip_files(archive) if zipfile.is_zipfile(archive) else []
                         if files:
                             entries, findings = _build_chain_from_files(files)
                             return _make_result(
@@ -697,18 +1304,21 @@ async def scan_url(
             except Exception:
                 pass  # Fall through to generic URL fetch
 
-    # Generic URL fetch
+    # Generic URL fetch, hashed as the body streams in
+    digest = hashlib.sha256()
+    size = 0
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-            resp = await client.get(url, headers={
-                "User-Agent": "pruv-scanner/1.0",
-            })
+        async with _fetch(url, 30.0, headers={
+            "User-Agent": "pruv-scanner/1.0",
+        }) as resp:
             if resp.status_code != 200:
                 raise HTTPException(
                     status_code=502,
                     detail=f"URL returned status {resp.status_code}",
                 )
-            content = resp.content
+            async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK):
+                digest.update(chunk)
+                size += len(chunk)
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Timeout fetching URL")
     except HTTPException:
@@ -717,10 +1327,8 @@ async def scan_url(
         raise HTTPException(status_code=502, detail=f"Failed to fetch URL: {str(e)}")
 
     # Build single-entry chain
-    from xycore.crypto import compute_xy
-
     x = "GENESIS"
-    y = _hash_bytes(content)
+    y = digest.hexdigest()
     ts = time.time()
     xy = compute_xy(x, url, y, ts)
 
@@ -733,7 +1341,7 @@ async def scan_url(
         "xy": xy,
         "path": url,
         "file_type": "url",
-        "size": len(content),
+        "size": size,
         "verified": True,
     }
 
@@ -746,56 +1354,68 @@ async def scan_url(
 
 @router.get("/{scan_id}/receipt")
 async def get_scan_receipt(
-    scan_id: str,
+    scan_id: ScanId,
+    request: Request,
 ):
     """Generate a self-contained HTML receipt for a scan. Public — no auth needed."""
     from ..services.receipt_html import generate_receipt_html
 
-    try:
-        with _get_session() as session:
-            scan = session.query(ScanResultModel).filter(ScanResultModel.id == scan_id).first()
-            if not scan:
-                raise HTTPException(status_code=404, detail="Scan not found")
-
-            html_content = generate_receipt_html(
-                scan_id=scan.id,
-                source=None,
-                started_at=scan.started_at.strftime("%Y-%m-%dT%H:%M:%SZ") if scan.started_at else "",
-                completed_at=scan.completed_at.strftime("%Y-%m-%dT%H:%M:%SZ") if scan.completed_at else None,
-                entries=[],
-                findings=scan.findings or [],
-                summary=None,
-            )
-            return HTMLResponse(content=html_content, media_type="text/html")
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=404, detail="Scan not found")
+    etag = make_etag("scan-receipt", scan_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": _IMMUTABLE_CACHE_CONTROL}
+
+    body = _receipt_cache.get(scan_id)
+    if body is not None:
+        return HTMLResponse(content=body, headers=headers)
+
+    scan = _load_scan(scan_id)
+    html_content = generate_receipt_html(
+        scan_id=scan.id,
+        source=None,
+        started_at=_format_timestamp(scan.started_at) if scan.started_at else "",
+        completed_at=_format_timestamp(scan.completed_at) if scan.completed_at else None,
+        entries=[],
+        findings=scan.findings or [],
+        summary=None,
+    )
+
+    # Cache the encoded page; Starlette sends bytes as-is and derives
+    # Content-Length from them, so warm hits skip the UTF-8 encode.
+    body = html_content.encode("utf-8")
+    _receipt_cache.set(scan_id, body)
+    return HTMLResponse(content=body, headers=headers)
 
 
-@router.get("/{scan_id}", response_model=ScanResponse)
+@router.get("/{scan_id}", responses={200: {"model": ScanResponse}})
 async def get_scan_status(
-    scan_id: str,
+    scan_id: ScanId,
+    request: Request,
 ):
     """Get the status and results of a scan."""
-    try:
-        with _get_session() as session:
-            scan = session.query(ScanResultModel).filter(ScanResultModel.id == scan_id).first()
-            if not scan:
-                raise HTTPException(status_code=404, detail="Scan not found")
-            return {
-                "id": scan.id,
-                "status": scan.status,
-                "chain_id": scan.chain_id,
-                "source": None,
-                "started_at": scan.started_at.strftime("%Y-%m-%dT%H:%M:%SZ") if scan.started_at else None,
-                "completed_at": scan.completed_at.strftime("%Y-%m-%dT%H:%M:%SZ") if scan.completed_at else None,
-                "findings": scan.findings or [],
-                "entries": [],
-                "summary": None,
-                "receipt_id": scan.receipt_id,
-            }
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=404, detail="Scan not found")
+    etag = make_etag("scan", scan_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": _IMMUTABLE_CACHE_CONTROL}
+
+    body = _result_cache.get(scan_id)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    scan = _load_scan(scan_id)
+    body = orjson.dumps({
+        "id": scan.id,
+        "status": scan.status,
+        "chain_id": scan.chain_id,
+        "source": None,
+        "started_at": _format_timestamp(scan.started_at) if scan.started_at else None,
+        "completed_at": _format_timestamp(scan.completed_at) if scan.completed_at else None,
+        "findings": _findings_to_response(scan.findings or []),
+        "entries": [],
+        "summary": None,
+        "receipt_id": scan.receipt_id,
+        "findings_truncated": _is_truncated(scan.findings or []),
+    })
+    if scan.status == "completed":
+        _result_cache.set(scan_id, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import ipaddress
 import secrets
+import socket
 import time
-import uuid
 from typing import Any
 from urllib.parse import urlparse
 
@@ -14,11 +15,19 @@ from pydantic import BaseModel, Field
 
 from ..core.dependencies import check_rate_limit, get_current_user, require_write
 from ..core.rate_limit import RateLimitResult
+from ..core.responses import ORJSONResponse
 
-router = APIRouter(prefix="/v1/webhooks", tags=["webhooks"])
+router = APIRouter(
+    prefix="/v1/webhooks",
+    tags=["webhooks"],
+    default_response_class=ORJSONResponse,
+)
 
 # In-memory webhook storage
 _webhooks: dict[str, dict[str, Any]] = {}
+# Same webhook dicts indexed by owner, in creation order, so listing
+# does not scan every user's webhooks
+_webhooks_by_user: dict[str, dict[str, dict[str, Any]]] = {}
 
 VALID_EVENTS = [
     "chain.created",
@@ -32,12 +41,16 @@ VALID_EVENTS = [
     "verification.failed",
     "alert.triggered",
 ]
+_VALID_EVENT_SET = frozenset(VALID_EVENTS)
 
 _BLOCKED_HOSTS = {"localhost", "127.0.0.1", "0.0.0.0", "[::1]"}
 
+# Stored on each webhook but never listed back to the owner
+_PRIVATE_FIELDS = frozenset({"user_id"})
 
-def _validate_webhook_url(url: str) -> None:
-    """Validate a webhook URL to prevent SSRF."""
+
+def _validate_webhook_url(url: str) -> str:
+    """Validate a webhook URL to prevent SSRF. Returns its hostname."""
     parsed = urlparse(url)
     if parsed.scheme not in ("https",):
         raise HTTPException(status_code=400, detail="Webhook URL must use HTTPS")
@@ -48,17 +61,53 @@ def _validate_webhook_url(url: str) -> None:
         raise HTTPException(status_code=400, detail="Webhook URL cannot target localhost")
     try:
         ip = ipaddress.ip_address(hostname)
-        if ip.is_private or ip.is_loopback or ip.is_reserved:
-            raise HTTPException(status_code=400, detail="Webhook URL cannot target private addresses")
     except ValueError:
-        pass  # Not an IP, it's a hostname — that's fine
+        return hostname  # Not an IP, it's a hostname — checked once resolved
+    _check_webhook_ip(ip)
+    return hostname
+
+
+def _check_webhook_ip(ip: ipaddress.IPv4Address | ipaddress.IPv6Address) -> None:
+    if ip.is_private or ip.is_loopback or ip.is_reserved:
+        raise HTTPException(status_code=400, detail="Webhook URL cannot target private addresses")
+
+
+async def _check_webhook_host(hostname: str) -> None:
+    """Resolve a webhook hostname and reject it if any address is internal.
+
+    This is a create/update-time check only: nothing delivers webhooks
+    yet, so nothing connects to these addresses, and a later DNS answer
+    is not re-checked. A name that does not resolve yet is accepted.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(hostname, 443, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        return
+    for address in {info[4][0] for info in infos}:
+        # Drop any IPv6 zone index ("fe80::1%eth0") before parsing
+        _check_webhook_ip(ipaddress.ip_address(address.partition("%")[0]))
+
+
+def _own_or_404(webhook_id: str, user_id: str) -> dict[str, Any]:
+    """Return the caller's webhook, or 404 if it is missing or not theirs."""
+    wh = _webhooks_by_user.get(user_id, {}).get(webhook_id)
+    if wh is None:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return wh
+
+
+def _public_view(webhook: dict[str, Any]) -> dict[str, Any]:
+    """The webhook as returned to its owner."""
+    return {k: v for k, v in webhook.items() if k not in _PRIVATE_FIELDS}
 
 
 def _validate_events(events: list[str]) -> None:
     """Validate webhook event types."""
-    invalid = [e for e in events if e not in VALID_EVENTS]
-    if invalid:
-        raise HTTPException(status_code=400, detail=f"Invalid event types: {', '.join(invalid)}")
+    if _VALID_EVENT_SET.issuperset(events):
+        return
+    invalid = [e for e in events if e not in _VALID_EVENT_SET]
+    raise HTTPException(status_code=400, detail=f"Invalid event types: {', '.join(invalid)}")
 
 
 class WebhookCreate(BaseModel):
@@ -83,17 +132,18 @@ class WebhookUpdate(BaseModel):
     active: bool | None = None
 
 
-@router.post("", response_model=WebhookResponse)
+@router.post("", responses={200: {"model": WebhookResponse}})
 async def create_webhook(
     body: WebhookCreate,
     user: dict[str, Any] = Depends(require_write),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """Create a webhook endpoint."""
-    _validate_webhook_url(body.url)
+    hostname = _validate_webhook_url(body.url)
     _validate_events(body.events)
+    await _check_webhook_host(hostname)
 
-    webhook_id = uuid.uuid4().hex[:12]
+    webhook_id = secrets.token_hex(6)
     secret = secrets.token_hex(32)
     webhook = {
         "id": webhook_id,
@@ -105,7 +155,8 @@ async def create_webhook(
         "created_at": time.time(),
     }
     _webhooks[webhook_id] = webhook
-    return webhook
+    _webhooks_by_user.setdefault(user["id"], {})[webhook_id] = webhook
+    return _public_view(webhook)
 
 
 @router.get("")
@@ -114,28 +165,22 @@ async def list_webhooks(
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """List all webhooks for the current user."""
-    hooks = [
-        {k: v for k, v in wh.items() if k != "user_id"}
-        for wh in _webhooks.values()
-        if wh["user_id"] == user["id"]
-    ]
+    hooks = [_public_view(wh) for wh in _webhooks_by_user.get(user["id"], {}).values()]
     return {"webhooks": hooks}
 
 
-@router.get("/{webhook_id}", response_model=WebhookResponse)
+@router.get("/{webhook_id}", responses={200: {"model": WebhookResponse}})
 async def get_webhook(
     webhook_id: str,
     user: dict[str, Any] = Depends(get_current_user),
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """Get a webhook by ID."""
-    wh = _webhooks.get(webhook_id)
-    if not wh or wh["user_id"] != user["id"]:
-        raise HTTPException(status_code=404, detail="Webhook not found")
-    return wh
+    wh = _own_or_404(webhook_id, user["id"])
+    return _public_view(wh)
 
 
-@router.patch("/{webhook_id}", response_model=WebhookResponse)
+@router.patch("/{webhook_id}", responses={200: {"model": WebhookResponse}})
 async def update_webhook(
     webhook_id: str,
     body: WebhookUpdate,
@@ -143,12 +188,11 @@ async def update_webhook(
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """Update a webhook."""
-    wh = _webhooks.get(webhook_id)
-    if not wh or wh["user_id"] != user["id"]:
-        raise HTTPException(status_code=404, detail="Webhook not found")
+    wh = _own_or_404(webhook_id, user["id"])
 
     if body.url is not None:
-        _validate_webhook_url(body.url)
+        hostname = _validate_webhook_url(body.url)
+        await _check_webhook_host(hostname)
         wh["url"] = body.url
     if body.events is not None:
         _validate_events(body.events)
@@ -156,7 +200,7 @@ async def update_webhook(
     if body.active is not None:
         wh["active"] = body.active
 
-    return wh
+    return _public_view(wh)
 
 
 @router.delete("/{webhook_id}")
@@ -166,10 +210,9 @@ async def delete_webhook(
     _rl: RateLimitResult = Depends(check_rate_limit),
 ):
     """Delete a webhook."""
-    wh = _webhooks.get(webhook_id)
-    if not wh or wh["user_id"] != user["id"]:
-        raise HTTPException(status_code=404, detail="Webhook not found")
+    _own_or_404(webhook_id, user["id"])
     del _webhooks[webhook_id]
+    del _webhooks_by_user[user["id"]][webhook_id]
     return {"deleted": True}
 
 
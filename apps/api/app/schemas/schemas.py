@@ -5,7 +5,15 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+
+# ──── Path ID Patterns ────
+
+# Malformed IDs are rejected with 422 at routing time, before any DB lookup.
+IDENTITY_ID_PATTERN = r"^pi_[0-9a-f]{40}$"  # pi_ + sha256(public key)[:40]
+ARTIFACT_ID_PATTERN = r"^pa_.{1,40}$"  # pa_ + content_hash[:40]
+HEX_ID_PATTERN = r"^[0-9a-f-]{12,36}$"  # uuid4().hex[:12] receipts and scans
 
 
 # ──── Chain Schemas ────
@@ -170,6 +178,8 @@ class ReceiptCreate(BaseModel):
 class ReceiptListResponse(BaseModel):
     receipts: list["ReceiptResponse"]
     total: int
+    limit: int = 50
+    offset: int = 0
 
 
 class ReceiptResponse(BaseModel):
@@ -193,6 +203,11 @@ class ReceiptResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# Resolve the forward reference now so the validator is built at import,
+# not on the first listing request.
+ReceiptListResponse.model_rebuild()
+
+
 # ──── Certificate Schemas ────
 
 
@@ -386,6 +401,8 @@ class IdentityResponse(BaseModel):
 class IdentityListResponse(BaseModel):
     identities: list[IdentityResponse]
     total: int
+    limit: int = 50
+    offset: int = 0
 
 
 class IdentityVerifyResponse(BaseModel):
@@ -434,6 +451,8 @@ class ArtifactResponse(BaseModel):
 class ArtifactListResponse(BaseModel):
     artifacts: list[ArtifactResponse]
     total: int
+    limit: int = 50
+    offset: int = 0
 
 
 class ProvenanceVerifyResponse(BaseModel):
@@ -445,3 +464,12 @@ class ProvenanceVerifyResponse(BaseModel):
     transition_count: int
     current_hash: str
     message: str
+
+
+# ──── List Adapters ────
+
+# Built once at import. List routes validate and dump their items in a
+# single call through these instead of going through the wrapper model.
+CHAIN_LIST_ADAPTER = TypeAdapter(list[ChainResponse])
+ENTRY_LIST_ADAPTER = TypeAdapter(list[EntryResponse])
+RECEIPT_LIST_ADAPTER = TypeAdapter(list[ReceiptResponse])
@@ -14,10 +14,10 @@ import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 
-class AlertSeverity(Enum):
+class AlertSeverity(str, Enum):
     INFO = "info"
     WARNING = "warning"
     CRITICAL = "critical"
@@ -32,6 +32,19 @@ class Alert:
     entry_id: str | None = None
     data: dict[str, Any] | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict in AlertResponse shape."""
+        return {
+            "rule": self.rule,
+            "severity": self.severity.value,
+            "message": self.message,
+            "entry_id": self.entry_id,
+        }
+
+
+# Shared stand-in for missing or empty metadata, data and y_state dicts,
+# so the per-entry helpers do not allocate one per lookup. Never mutated.
+_EMPTY: dict[str, Any] = {}
 
 SENSITIVE_PATHS = (
     ".env", "credentials", "secrets", ".ssh",
@@ -40,35 +53,59 @@ SENSITIVE_PATHS = (
 
 
 def analyze_chain(chain: dict[str, Any], entries: list[dict[str, Any]]) -> list[Alert]:
-    """Run all rules against a chain and return alerts."""
+    """Run all rules against a chain and return alerts.
+
+    Entries are walked once; the per-entry rules share that pass and keep
+    their own state. Alerts come back grouped by rule, in rule order.
+    """
     chain_id = chain["id"]
-    alerts: list[Alert] = []
 
     if not entries:
-        return alerts
+        return []
 
-    alerts.extend(_check_error_rate(chain_id, entries))
-    alerts.extend(_check_action_rate(chain_id, entries))
-    alerts.extend(_check_new_tools(chain_id, entries))
-    alerts.extend(_check_sensitive_files(chain_id, entries))
-    alerts.extend(_check_new_domains(chain_id, entries))
+    error_count = 0
+    tools_seen: set[str] = set()
+    known_domains: set[str] = set()
+    tool_alerts: list[Alert] = []
+    file_alerts: list[Alert] = []
+    domain_alerts: list[Alert] = []
+
+    for entry in entries:
+        operation = entry.get("operation") or ""
+        # Operations are almost always lowercase already; only fold case
+        # (and allocate a copy) when the plain check misses.
+        if "error" in operation or (
+            not operation.islower() and "error" in operation.lower()
+        ):
+            error_count += 1
+        if "tool.start" in operation or "skill.start" in operation:
+            alert = _check_new_tool(chain_id, entry, tools_seen)
+            if alert:
+                tool_alerts.append(alert)
+        if "file.access" in operation:
+            alert = _check_sensitive_file(chain_id, entry)
+            if alert:
+                file_alerts.append(alert)
+        if "api.call" in operation:
+            alert = _check_new_domain(chain_id, entry, known_domains)
+            if alert:
+                domain_alerts.append(alert)
 
+    alerts: list[Alert] = []
+    alerts.extend(_check_error_rate(chain_id, error_count, len(entries)))
+    alerts.extend(_check_action_rate(chain_id, entries))
+    alerts.extend(tool_alerts)
+    alerts.extend(file_alerts)
+    alerts.extend(domain_alerts)
     return alerts
 
 
 # ─── Rule 1: High error rate ─────────────────────────────────────────────────
 
-def _check_error_rate(chain_id: str, entries: list[dict[str, Any]]) -> list[Alert]:
-    total = len(entries)
+def _check_error_rate(chain_id: str, error_count: int, total: int) -> list[Alert]:
     if total <= 5:
         return []
 
-    errors = [
-        e for e in entries
-        if ".error" in e.get("operation", "") or "error" in e.get("operation", "").lower()
-    ]
-    error_count = len(errors)
-
     if error_count / total > 0.3:
         return [Alert(
             rule="high_error_rate",
@@ -85,165 +122,175 @@ def _check_action_rate(chain_id: str, entries: list[dict[str, Any]]) -> list[Ale
     if len(entries) <= 100:
         return []
 
-    first_ts = entries[0].get("timestamp", 0)
-    last_ts = entries[-1].get("timestamp", 0)
-
     # Also check metadata.ts if timestamps are epoch
-    if not first_ts:
-        first_ts = _get_nested_ts(entries[0])
-    if not last_ts:
-        last_ts = _get_nested_ts(entries[-1])
+    first_ts = entries[0].get("timestamp") or _get_nested_ts(entries[0])
+    last_ts = entries[-1].get("timestamp") or _get_nested_ts(entries[-1])
 
     duration = last_ts - first_ts
-    if duration <= 0:
+    # rate > 30/min, compared without dividing
+    if duration <= 0 or len(entries) * 60 <= 30 * duration:
         return []
 
     rate = len(entries) / (duration / 60)  # actions per minute
-    if rate > 30:
-        return [Alert(
-            rule="high_action_rate",
-            severity=AlertSeverity.WARNING,
-            message=f"Agent performing {rate:.0f} actions/minute",
-            chain_id=chain_id,
-        )]
-    return []
+    return [Alert(
+        rule="high_action_rate",
+        severity=AlertSeverity.WARNING,
+        message=f"Agent performing {rate:.0f} actions/minute",
+        chain_id=chain_id,
+    )]
 
 
 # ─── Rule 3: New tool/skill usage ────────────────────────────────────────────
 
-def _check_new_tools(chain_id: str, entries: list[dict[str, Any]]) -> list[Alert]:
-    alerts: list[Alert] = []
-    tools_seen: set[str] = set()
-
-    for entry in entries:
-        operation = entry.get("operation", "")
-        if "tool.start" not in operation and "skill.start" not in operation:
-            continue
-
-        # Extract tool name from metadata or y_state
-        tool_name = _extract_tool_name(entry)
-        if not tool_name:
-            continue
-
-        if tool_name not in tools_seen and len(tools_seen) > 3:
-            alerts.append(Alert(
-                rule="new_tool",
-                severity=AlertSeverity.INFO,
-                message=f"Agent used new tool: {tool_name}",
-                chain_id=chain_id,
-                entry_id=entry.get("id"),
-            ))
-        tools_seen.add(tool_name)
-
-    return alerts
+def _check_new_tool(
+    chain_id: str, entry: dict[str, Any], tools_seen: set[str],
+) -> Alert | None:
+    # Extract tool name from metadata or y_state
+    tool_name = _extract_tool_name(entry)
+    if not tool_name:
+        return None
+
+    alert = None
+    if tool_name not in tools_seen and len(tools_seen) > 3:
+        alert = Alert(
+            rule="new_tool",
+            severity=AlertSeverity.INFO,
+            message=f"Agent used new tool: {tool_name}",
+            chain_id=chain_id,
+            entry_id=entry.get("id"),
+        )
+    tools_seen.add(tool_name)
+    return alert
 
 
 # ─── Rule 4: Sensitive file access ───────────────────────────────────────────
 
-def _check_sensitive_files(chain_id: str, entries: list[dict[str, Any]]) -> list[Alert]:
-    alerts: list[Alert] = []
-
-    for entry in entries:
-        operation = entry.get("operation", "")
-        if "file.access" not in operation:
-            continue
-
-        path = _extract_field(entry, "path")
-        if not path:
-            continue
-
-        path_lower = path.lower()
-        for sensitive in SENSITIVE_PATHS:
-            if sensitive in path_lower:
-                alerts.append(Alert(
-                    rule="sensitive_file_access",
-                    severity=AlertSeverity.CRITICAL,
-                    message=f"Agent accessed sensitive file: {path}",
-                    chain_id=chain_id,
-                    entry_id=entry.get("id"),
-                ))
-                break
-
-    return alerts
+def _check_sensitive_file(chain_id: str, entry: dict[str, Any]) -> Alert | None:
+    path = _extract_field(entry, "path")
+    if not path:
+        return None
+
+    path_lower = path.lower()
+    for sensitive in SENSITIVE_PATHS:
+        if sensitive in path_lower:
+            return Alert(
+                rule="sensitive_file_access",
+                severity=AlertSeverity.CRITICAL,
+                message=f"Agent accessed sensitive file: {path}",
+                chain_id=chain_id,
+                entry_id=entry.get("id"),
+            )
+    return None
 
 
 # ─── Rule 5: New API domains ─────────────────────────────────────────────────
 
-def _check_new_domains(chain_id: str, entries: list[dict[str, Any]]) -> list[Alert]:
-    alerts: list[Alert] = []
-    known_domains: set[str] = set()
+def _check_new_domain(
+    chain_id: str, entry: dict[str, Any], known_domains: set[str],
+) -> Alert | None:
+    url = _extract_field(entry, "url")
+    if not url:
+        return None
+
+    domain = _extract_domain(url)
+    if not domain:
+        return None
+
+    alert = None
+    if domain not in known_domains and len(known_domains) > 2:
+        alert = Alert(
+            rule="new_api_domain",
+            severity=AlertSeverity.INFO,
+            message=f"Agent contacted new domain: {domain}",
+            chain_id=chain_id,
+            entry_id=entry.get("id"),
+        )
+    known_domains.add(domain)
+    return alert
 
-    for entry in entries:
-        operation = entry.get("operation", "")
-        if "api.call" not in operation:
-            continue
-
-        url = _extract_field(entry, "url")
-        if not url:
-            continue
-
-        domain = _extract_domain(url)
-        if not domain:
-            continue
-
-        if domain not in known_domains and len(known_domains) > 2:
-            alerts.append(Alert(
-                rule="new_api_domain",
-                severity=AlertSeverity.INFO,
-                message=f"Agent contacted new domain: {domain}",
-                chain_id=chain_id,
-                entry_id=entry.get("id"),
-            ))
-        known_domains.add(domain)
 
-    return alerts
+# ─── Helpers ──────────────────────────────────────────────────────────────────
 
+# Characters that make the hand-sliced authority differ from
+# urlsplit(...).hostname: userinfo, port, IPv6 brackets and zone ids
+# (hostname keeps the case of anything after "%").
+_AUTHORITY_SPECIAL = frozenset("@:[]%")
 
-# ─── Helpers ──────────────────────────────────────────────────────────────────
 
 def _extract_domain(url: str) -> str:
-    """Extract domain from URL."""
+    """Extract the hostname (urlsplit's .hostname) from a URL, or "".
+
+    Plain "scheme://host/..." URLs are sliced by hand, since this runs
+    once per api.call entry; anything with userinfo, a port, brackets,
+    "%", whitespace or no scheme goes through urlsplit.
+    """
+    start = url.find("://")
+    if start > 0 and _is_scheme(url[:start]):
+        host_start = start + 3
+        end = len(url)
+        for sep in "/?#":
+            i = url.find(sep, host_start, end)
+            if i >= 0:
+                end = i
+        host = url[host_start:end]
+        if (
+            host
+            and host.isascii()
+            and host.isprintable()
+            and " " not in host
+            and _AUTHORITY_SPECIAL.isdisjoint(host)
+        ):
+            return host.lower()
     try:
-        return urlparse(url).netloc
-    except Exception:
+        return urlsplit(url.strip()).hostname or ""
+    except ValueError:
         return ""
 
 
+def _is_scheme(scheme: str) -> bool:
+    """Whether urlsplit would accept ``scheme`` as a URL scheme."""
+    return (
+        scheme.isascii()
+        and scheme[0].isalpha()
+        and scheme.replace("+", "").replace("-", "").replace(".", "").isalnum()
+    )
+
+
 def _get_nested_ts(entry: dict[str, Any]) -> float:
     """Try to get timestamp from nested metadata."""
-    meta = entry.get("metadata") or {}
+    meta = entry.get("metadata") or _EMPTY
     return meta.get("ts", 0) or meta.get("timestamp", 0)
 
 
 def _extract_tool_name(entry: dict[str, Any]) -> str:
     """Extract tool/skill name from entry metadata or y_state."""
-    meta = entry.get("metadata") or {}
+    meta = entry.get("metadata") or _EMPTY
     name = meta.get("tool") or meta.get("skill") or ""
     if name:
         return name
 
     # Try nested data
-    data = meta.get("data") or {}
+    data = meta.get("data") or _EMPTY
     name = data.get("tool") or data.get("skill") or ""
     if name:
         return name
 
     # Try y_state
-    y_state = entry.get("y_state") or {}
+    y_state = entry.get("y_state") or _EMPTY
     return y_state.get("tool") or y_state.get("skill") or ""
 
 
 def _extract_field(entry: dict[str, Any], field_name: str) -> str:
     """Extract a field from entry metadata or y_state."""
-    meta = entry.get("metadata") or {}
+    meta = entry.get("metadata") or _EMPTY
     val = meta.get(field_name) or ""
     if val:
         return val
 
-    data = meta.get("data") or {}
+    data = meta.get("data") or _EMPTY
     val = data.get(field_name) or ""
     if val:
         return val
 
-    y_state = entry.get("y_state") or {}
+    y_state = entry.get("y_state") or _EMPTY
     return y_state.get(field_name) or ""
@@ -10,6 +10,7 @@ from typing import Any
 
 from sqlalchemy.orm import Session, sessionmaker
 
+from ..core.config import settings
 from ..core.security import generate_api_key, hash_api_key
 from ..models.database import ApiKey, Base, User, get_engine
 
@@ -34,7 +35,7 @@ class AuthService:
     def _session(self) -> Session:
         if not self._session_factory:
             # Auto-initialize with SQLite for development/testing
-            self.init_db("sqlite:///pruv_dev.db")
+            self.init_db(settings.effective_database_url)
         return self._session_factory()
 
     # ──── Users ────
@@ -9,7 +9,7 @@ import logging
 import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
@@ -17,7 +17,8 @@ from sqlalchemy.orm import Session, sessionmaker
 from xycore import XYEntry, hash_state, verify_chain
 from xycore.redact import redact_state
 
-from ..models.database import Base, Chain, Entry, get_engine
+from ..core.config import settings
+from ..models.database import Base, Chain, ChainVerification, Entry, get_engine
 
 logger = logging.getLogger("pruv.api.chain_service")
 
@@ -29,6 +30,11 @@ def _ts_to_float(dt: datetime | None) -> float:
     return dt.timestamp()
 
 
+def chain_head(session: Session, chain_id: str) -> str | None:
+    """Look up a chain's head xy hash — one primary-key read."""
+    return session.query(Chain.head_xy).filter(Chain.id == chain_id).scalar()
+
+
 def _chain_to_dict(chain: Chain) -> dict[str, Any]:
     """Convert a Chain ORM model to the dict format routes expect."""
     return {
@@ -88,7 +94,7 @@ class ChainService:
 
     def _session(self) -> Session:
         if not self._session_factory:
-            self.init_db("sqlite:///pruv_dev.db")
+            self.init_db(settings.effective_database_url)
         return self._session_factory()
 
     def create_chain(
@@ -253,6 +259,9 @@ class ChainService:
                 return False
             # Delete entries first (cascade should handle but be explicit)
             session.query(Entry).filter(Entry.chain_id == chain_id).delete()
+            session.query(ChainVerification).filter(
+                ChainVerification.chain_id == chain_id
+            ).delete()
             session.delete(chain)
             session.commit()
             return True
@@ -332,8 +341,81 @@ class ChainService:
             )
             return [_entry_to_dict(e) for e in entries]
 
+    def iter_entries(
+        self, chain_id: str, offset: int = 0, limit: int | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield entries in index order, fetching ``batch_size`` rows at a time.
+
+        The session stays open until the iterator is exhausted or closed.
+        """
+        with self._session() as session:
+            query = (
+                session.query(Entry)
+                .filter(Entry.chain_id == chain_id)
+                .order_by(Entry.index)
+                .offset(offset)
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            for e in query.yield_per(batch_size):
+                yield _entry_to_dict(e)
+
+    def get_scan_target(
+        self, chain_id: str, user_id: str | None = None,
+    ) -> tuple[bool, dict[str, Any] | None]:
+        """Check chain access and read its verified prefix in one query.
+
+        Returns ``(found, prefix)``; ``found`` is False when the chain is
+        missing or owned by another user, as in get_chain.
+        """
+        with self._session() as session:
+            row = (
+                session.query(Chain.user_id, ChainVerification)
+                .outerjoin(ChainVerification, ChainVerification.chain_id == Chain.id)
+                .filter(Chain.id == chain_id)
+                .first()
+            )
+            if not row:
+                return False, None
+            owner, verification = row
+            if user_id and str(owner) != user_id:
+                return False, None
+            if verification is None:
+                return True, None
+            return True, {
+                "index": verification.last_verified_index,
+                "y": verification.last_verified_y,
+                "xy": verification.last_verified_xy,
+                "digest": verification.prefix_digest,
+            }
+
+    def record_verified_prefix(
+        self, chain_id: str, entry: dict[str, Any], digest: str,
+    ) -> None:
+        """Mark the chain verified up to and including ``entry``.
+
+        ``digest`` covers every entry up to ``entry``; a scan that finds a
+        different digest there verifies the prefix again.
+        """
+        with self._session() as session:
+            session.merge(ChainVerification(
+                chain_id=chain_id,
+                last_verified_index=entry["index"],
+                last_verified_y=entry["y"],
+                last_verified_xy=entry["xy"],
+                prefix_digest=digest,
+            ))
+            session.commit()
+
     def verify_chain(self, chain_id: str) -> dict[str, Any]:
         entries_data = self.list_entries(chain_id, offset=0, limit=100000)
+        return self.verify_entries(chain_id, entries_data)
+
+    def verify_entries(
+        self, chain_id: str, entries_data: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Verify already-loaded entries, for callers that also need them."""
         if not entries_data:
             return {"chain_id": chain_id, "valid": True, "length": 0, "break_index": None}
 
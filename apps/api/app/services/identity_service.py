@@ -6,13 +6,17 @@ import hashlib
 import logging
 import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session, sessionmaker
 
+from ..core.cache import TTLCache
+from ..core.config import settings
 from ..models.database import Base, Chain, Entry, IdentityRecord, get_engine
-from .chain_service import chain_service
+from .chain_service import chain_head, chain_service
 
 logger = logging.getLogger("pruv.api.identity_service")
 
@@ -37,11 +41,58 @@ def _identity_to_dict(record: IdentityRecord) -> dict[str, Any]:
     }
 
 
+@dataclass
+class IdentitySnapshot:
+    """Identity, verification result and recent history from one chain read."""
+    identity: dict[str, Any]
+    verification: dict[str, Any]
+    history: list[dict[str, Any]]
+
+
+def _verification_from_entries(
+    record: IdentityRecord,
+    chain_result: dict[str, Any],
+    entries: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Build the identity verification result from a verified chain."""
+    chain_intact = chain_result.get("valid", False)
+    action_count = max(len(entries) - 1, 0)  # exclude registration entry
+
+    if chain_intact:
+        message = (
+            f"✓ Identity verified: {record.name} · "
+            f"{action_count} actions · chain intact"
+        )
+    else:
+        break_idx = chain_result.get("break_index")
+        message = f"✗ Identity verification failed at entry {break_idx}"
+
+    return {
+        "valid": chain_intact,
+        "identity_id": record.id,
+        "name": record.name,
+        "action_count": action_count,
+        "chain_intact": chain_intact,
+        "message": message,
+    }
+
+
+def _history_from_entries(
+    entries: list[dict[str, Any]], limit: int, offset: int
+) -> list[dict[str, Any]]:
+    """Skip the registration entry and page through actions, newest first."""
+    actions = entries[1:]
+    actions.reverse()
+    return actions[offset : offset + limit]
+
+
 class IdentityService:
     """PostgreSQL-backed identity service."""
 
     def __init__(self) -> None:
         self._session_factory: sessionmaker | None = None
+        # (identity_id, chain head xy) -> verification result
+        self._verify_cache = TTLCache(maxsize=8192, ttl=60)
 
     def init_db(self, database_url: str) -> None:
         """Initialize the database connection."""
@@ -54,7 +105,7 @@ class IdentityService:
 
     def _session(self) -> Session:
         if not self._session_factory:
-            self.init_db("sqlite:///pruv_dev.db")
+            self.init_db(settings.effective_database_url)
         return self._session_factory()
 
     def register(
@@ -160,17 +211,48 @@ class IdentityService:
                 return None
             return _identity_to_dict(record)
 
-    def list_identities(self, user_id: str) -> list[dict[str, Any]]:
-        """List all identities for a user."""
+    def list_identities(
+        self, user_id: str, limit: int = 50, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """List a page of identities for a user, most recent first."""
         with self._session() as session:
             records = (
                 session.query(IdentityRecord)
                 .filter(IdentityRecord.user_id == user_id)
                 .order_by(IdentityRecord.registered_at.desc())
+                .offset(offset)
+                .limit(limit)
                 .all()
             )
             return [_identity_to_dict(r) for r in records]
 
+    def get_identity_count(self, user_id: str) -> int:
+        """Count all identities for a user without loading them."""
+        with self._session() as session:
+            return (
+                session.query(IdentityRecord)
+                .filter(IdentityRecord.user_id == user_id)
+                .count()
+            )
+
+    def get_listing_version(self, user_id: str) -> str:
+        """Return a tag that changes whenever the user's identities change.
+
+        Built from an aggregate query so the listing ETag can be checked
+        without loading any identity rows.
+        """
+        with self._session() as session:
+            count, last_registered, last_action = (
+                session.query(
+                    func.count(IdentityRecord.id),
+                    func.max(IdentityRecord.registered_at),
+                    func.max(IdentityRecord.last_action_at),
+                )
+                .filter(IdentityRecord.user_id == user_id)
+                .one()
+            )
+            return f"{count}:{last_registered}:{last_action}"
+
     def act(
         self,
         identity_id: str,
@@ -229,29 +311,16 @@ class IdentityService:
             if not record:
                 return None
 
-            chain_result = chain_service.verify_chain(record.chain_id)
-            entries = chain_service.list_entries(record.chain_id, offset=0, limit=100000)
-
-            chain_intact = chain_result.get("valid", False)
-            action_count = max(len(entries) - 1, 0)  # exclude registration entry
+            cache_key = (identity_id, chain_head(session, record.chain_id))
+            cached = self._verify_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
 
-            if chain_intact:
-                message = (
-                    f"✓ Identity verified: {record.name} · "
-                    f"{action_count} actions · chain intact"
-                )
-            else:
-                break_idx = chain_result.get("break_index")
-                message = f"✗ Identity verification failed at entry {break_idx}"
-
-            return {
-                "valid": chain_intact,
-                "identity_id": identity_id,
-                "name": record.name,
-                "action_count": action_count,
-                "chain_intact": chain_intact,
-                "message": message,
-            }
+            entries = chain_service.list_entries(record.chain_id, offset=0, limit=100000)
+            chain_result = chain_service.verify_entries(record.chain_id, entries)
+            result = _verification_from_entries(record, chain_result, entries)
+            self._verify_cache.set(cache_key, result)
+            return dict(result)
 
     def get_history(
         self, identity_id: str, limit: int = 50, offset: int = 0
@@ -269,11 +338,69 @@ class IdentityService:
             entries = chain_service.list_entries(
                 record.chain_id, offset=0, limit=100000
             )
-            # Skip registration entry, reverse for most recent first
-            actions = entries[1:]
-            actions.reverse()
-            # Apply pagination
-            return actions[offset : offset + limit]
+            return _history_from_entries(entries, limit, offset)
+
+    def get_chain_head(
+        self, identity_id: str, user_id: str | None = None
+    ) -> str | None:
+        """Return the head xy of the identity's chain, or None if not found.
+
+        One joined read, cheap enough to key rendered receipts on.
+        """
+        with self._session() as session:
+            row = (
+                session.query(IdentityRecord.user_id, Chain.head_xy)
+                .join(Chain, Chain.id == IdentityRecord.chain_id)
+                .filter(IdentityRecord.id == identity_id)
+                .first()
+            )
+            if not row:
+                return None
+            if user_id and str(row.user_id) != user_id:
+                return None
+            return row.head_xy or ""
+
+    def render_snapshot(
+        self,
+        identity_id: str,
+        user_id: str | None = None,
+        history_limit: int = 100,
+    ) -> IdentitySnapshot | None:
+        """Load an identity, verify its chain and page its history at once.
+
+        The chain entries are read a single time and shared between
+        verification and history, instead of the three separate reads
+        that get_identity + verify + get_history would issue.
+        """
+        with self._session() as session:
+            record = (
+                session.query(IdentityRecord)
+                .filter(IdentityRecord.id == identity_id)
+                .first()
+            )
+            if not record:
+                return None
+            if user_id and str(record.user_id) != user_id:
+                return None
+
+            # Head before entries, as in verify(): an append between the
+            # two reads must not file old entries under the new head.
+            cache_key = (identity_id, chain_head(session, record.chain_id))
+            entries = chain_service.list_entries(
+                record.chain_id, offset=0, limit=100000
+            )
+            verification = self._verify_cache.get(cache_key)
+            if verification is None:
+                chain_result = chain_service.verify_entries(record.chain_id, entries)
+                verification = _verification_from_entries(
+                    record, chain_result, entries
+                )
+                self._verify_cache.set(cache_key, verification)
+            return IdentitySnapshot(
+                identity=_identity_to_dict(record),
+                verification=dict(verification),
+                history=_history_from_entries(entries, history_limit, 0),
+            )
 
 
 # Global instance
@@ -4,13 +4,17 @@ from __future__ import annotations
 
 import logging
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session, sessionmaker
 
-from ..models.database import ArtifactRecord, Base, get_engine
-from .chain_service import chain_service
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models.database import ArtifactRecord, Base, Chain, get_engine
+from .chain_service import chain_head, chain_service
 
 logger = logging.getLogger("pruv.api.provenance_service")
 
@@ -32,11 +36,77 @@ def _artifact_to_dict(record: ArtifactRecord) -> dict[str, Any]:
     }
 
 
+@dataclass
+class ProvenanceSnapshot:
+    """Artifact, verification result and history from one chain read."""
+    artifact: dict[str, Any]
+    verification: dict[str, Any]
+    history: list[dict[str, Any]]
+
+
+def _verification_from_entries(
+    record: ArtifactRecord,
+    chain_result: dict[str, Any],
+    entries: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Build the provenance verification result from a verified chain."""
+    chain_intact = chain_result.get("valid", False)
+
+    # Check origin entry
+    origin_intact = False
+    if entries:
+        origin_state = entries[0].get("y_state") or {}
+        origin_intact = origin_state.get("content_hash") == record.content_hash
+
+    # Check transition chain
+    transitions = entries[1:]
+    transition_hashes_valid = True
+    expected_hash = record.content_hash
+
+    for t in transitions:
+        t_state = t.get("y_state") or {}
+        if t_state.get("previous_hash") != expected_hash:
+            transition_hashes_valid = False
+            break
+        expected_hash = t_state.get("new_hash", expected_hash)
+
+    valid = chain_intact and origin_intact and transition_hashes_valid
+
+    if valid:
+        message = (
+            f"✓ Provenance verified: {record.name} · "
+            f"origin intact · {len(transitions)} modification(s) · "
+            f"chain verified"
+        )
+    else:
+        parts = []
+        if not chain_intact:
+            parts.append("chain broken")
+        if not origin_intact:
+            parts.append("origin tampered")
+        if not transition_hashes_valid:
+            parts.append("transition hash mismatch")
+        message = f"✗ Provenance failed: {', '.join(parts)}"
+
+    return {
+        "valid": valid,
+        "artifact_id": record.id,
+        "name": record.name,
+        "origin_intact": origin_intact,
+        "chain_intact": chain_intact,
+        "transition_count": len(transitions),
+        "current_hash": record.current_hash,
+        "message": message,
+    }
+
+
 class ProvenanceService:
     """PostgreSQL-backed provenance service."""
 
     def __init__(self) -> None:
         self._session_factory: sessionmaker | None = None
+        # (artifact_id, chain head xy) -> verification result
+        self._verify_cache = TTLCache(maxsize=8192, ttl=60)
 
     def init_db(self, database_url: str) -> None:
         """Initialize the database connection."""
@@ -49,7 +119,7 @@ class ProvenanceService:
 
     def _session(self) -> Session:
         if not self._session_factory:
-            self.init_db("sqlite:///pruv_dev.db")
+            self.init_db(settings.effective_database_url)
         return self._session_factory()
 
     def register_origin(
@@ -129,17 +199,48 @@ class ProvenanceService:
                 return None
             return _artifact_to_dict(record)
 
-    def list_artifacts(self, user_id: str) -> list[dict[str, Any]]:
-        """List all artifacts for a user."""
+    def list_artifacts(
+        self, user_id: str, limit: int = 50, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """List a page of artifacts for a user, most recent first."""
         with self._session() as session:
             records = (
                 session.query(ArtifactRecord)
                 .filter(ArtifactRecord.user_id == user_id)
                 .order_by(ArtifactRecord.created_at.desc())
+                .offset(offset)
+                .limit(limit)
                 .all()
             )
             return [_artifact_to_dict(r) for r in records]
 
+    def get_artifact_count(self, user_id: str) -> int:
+        """Count all artifacts for a user without loading them."""
+        with self._session() as session:
+            return (
+                session.query(ArtifactRecord)
+                .filter(ArtifactRecord.user_id == user_id)
+                .count()
+            )
+
+    def get_listing_version(self, user_id: str) -> str:
+        """Return a tag that changes whenever the user's artifacts change.
+
+        Built from an aggregate query so the listing ETag can be checked
+        without loading any artifact rows.
+        """
+        with self._session() as session:
+            count, last_created, last_modified = (
+                session.query(
+                    func.count(ArtifactRecord.id),
+                    func.max(ArtifactRecord.created_at),
+                    func.max(ArtifactRecord.last_modified_at),
+                )
+                .filter(ArtifactRecord.user_id == user_id)
+                .one()
+            )
+            return f"{count}:{last_created}:{last_modified}"
+
     def transition(
         self,
         artifact_id: str,
@@ -202,59 +303,18 @@ class ProvenanceService:
             if not record:
                 return None
 
-            chain_result = chain_service.verify_chain(record.chain_id)
+            cache_key = (artifact_id, chain_head(session, record.chain_id))
+            cached = self._verify_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+
             entries = chain_service.list_entries(
                 record.chain_id, offset=0, limit=100000
             )
-
-            chain_intact = chain_result.get("valid", False)
-
-            # Check origin entry
-            origin_intact = False
-            if entries:
-                origin_state = entries[0].get("y_state") or {}
-                origin_intact = origin_state.get("content_hash") == record.content_hash
-
-            # Check transition chain
-            transitions = entries[1:]
-            transition_hashes_valid = True
-            expected_hash = record.content_hash
-
-            for t in transitions:
-                t_state = t.get("y_state") or {}
-                if t_state.get("previous_hash") != expected_hash:
-                    transition_hashes_valid = False
-                    break
-                expected_hash = t_state.get("new_hash", expected_hash)
-
-            valid = chain_intact and origin_intact and transition_hashes_valid
-
-            if valid:
-                message = (
-                    f"✓ Provenance verified: {record.name} · "
-                    f"origin intact · {len(transitions)} modification(s) · "
-                    f"chain verified"
-                )
-            else:
-                parts = []
-                if not chain_intact:
-                    parts.append("chain broken")
-                if not origin_intact:
-                    parts.append("origin tampered")
-                if not transition_hashes_valid:
-                    parts.append("transition hash mismatch")
-                message = f"✗ Provenance failed: {', '.join(parts)}"
-
-            return {
-                "valid": valid,
-                "artifact_id": artifact_id,
-                "name": record.name,
-                "origin_intact": origin_intact,
-                "chain_intact": chain_intact,
-                "transition_count": len(transitions),
-                "current_hash": record.current_hash,
-                "message": message,
-            }
+            chain_result = chain_service.verify_entries(record.chain_id, entries)
+            result = _verification_from_entries(record, chain_result, entries)
+            self._verify_cache.set(cache_key, result)
+            return dict(result)
 
     def get_history(
         self, artifact_id: str, limit: int = 50, offset: int = 0
@@ -274,6 +334,67 @@ class ProvenanceService:
             )
             return entries[offset : offset + limit]
 
+    def get_chain_head(
+        self, artifact_id: str, user_id: str | None = None
+    ) -> str | None:
+        """Return the head xy of the artifact's chain, or None if not found.
+
+        One joined read, cheap enough to key rendered receipts on.
+        """
+        with self._session() as session:
+            row = (
+                session.query(ArtifactRecord.user_id, Chain.head_xy)
+                .join(Chain, Chain.id == ArtifactRecord.chain_id)
+                .filter(ArtifactRecord.id == artifact_id)
+                .first()
+            )
+            if not row:
+                return None
+            if user_id and str(row.user_id) != user_id:
+                return None
+            return row.head_xy or ""
+
+    def render_snapshot(
+        self,
+        artifact_id: str,
+        user_id: str | None = None,
+        history_limit: int = 100,
+    ) -> ProvenanceSnapshot | None:
+        """Load an artifact, verify its chain and page its history at once.
+
+        The chain entries are read a single time and shared between
+        verification and history.
+        """
+        with self._session() as session:
+            record = (
+                session.query(ArtifactRecord)
+                .filter(ArtifactRecord.id == artifact_id)
+                .first()
+            )
+            if not record:
+                return None
+            if user_id and str(record.user_id) != user_id:
+                return None
+
+            # Head before entries, as in verify(): an append between the
+            # two reads must not file old entries under the new head.
+            cache_key = (artifact_id, chain_head(session, record.chain_id))
+            entries = chain_service.list_entries(
+                record.chain_id, offset=0, limit=100000
+            )
+            verification = self._verify_cache.get(cache_key)
+            if verification is None:
+                chain_result = chain_service.verify_entries(record.chain_id, entries)
+                verification = _verification_from_entries(
+                    record, chain_result, entries
+                )
+                self._verify_cache.set(cache_key, verification)
+            return ProvenanceSnapshot(
+                artifact=_artifact_to_dict(record),
+                verification=dict(verification),
+                history=entries[:history_limit],
+            )
+
 
 # Global instance
 provenance_service = ProvenanceService()
@@ -2,151 +2,93 @@
 
 from __future__ import annotations
 
-import html
-import json
 from typing import Any
 
+import orjson
 
-def generate_receipt_html(
-    scan_id: str,
-    source: str | None,
-    started_at: str,
-    completed_at: str | None,
-    entries: list[dict[str, Any]],
-    findings: list[dict[str, Any]],
-    summary: str | None,
-) -> str:
-    """Generate a self-contained HTML receipt for a scan.
+from ..core.cache import TTLCache
 
-    The receipt includes:
-    - Scan metadata (source, time, file count, status)
-    - Every file entry with path, hash, chain position, verification status
-    - Chain proof data (root hash, head hash, entry count)
-    - A "Verify" button that recomputes all hashes client-side using
-      the Web Crypto API (SubtleCrypto SHA-256). No server needed.
-    """
-    total = len(entries)
-    critical_count = len([f for f in findings if f.get("severity") == "critical"])
-    all_verified = critical_count == 0
-    status_label = "all verified" if all_verified else f"{critical_count} integrity failure{'s' if critical_count != 1 else ''}"
-    status_icon = "&#x2713;" if all_verified else "&#x2717;"
-    status_color = "#4ade80" if all_verified else "#f87171"
+# Receipt status labels and colors
+STATUS_OK = "VERIFIED"
+STATUS_BAD = "BROKEN"
+COLOR_OK = "#00dc73"
+COLOR_BAD = "#ef4444"
 
-    root_hash = entries[0].get("y", entries[0].get("hash", "")) if entries else ""
-    head_hash = entries[-1].get("y", entries[-1].get("hash", "")) if entries else ""
-    root_xy = entries[0].get("xy", "") if entries else ""
-    head_xy = entries[-1].get("xy", "") if entries else ""
+# Same replacements as escape_html(quote=True), applied in a single pass.
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
 
-    display_source = html.escape(source or "unknown")
-    display_started = html.escape(started_at or "")
-    display_summary = html.escape(summary or f"{total} files scanned")
 
-    # Build entries JSON for the JavaScript verifier
-    entries_json = json.dumps([
-        {
-            "index": e.get("index", i),
-            "path": e.get("path", e.get("operation", f"entry-{i}")),
-            "x": e.get("x", ""),
-            "y": e.get("y", e.get("hash", "")),
-            "xy": e.get("xy", ""),
-            "operation": e.get("operation", e.get("path", "")),
-            "timestamp": e.get("timestamp", 0),
-            "file_type": e.get("file_type", ""),
-            "size": e.get("size", 0),
-        }
-        for i, e in enumerate(entries)
-    ])
+def escape_html(value: str) -> str:
+    """Escape a string for HTML text or attribute context."""
+    return value.translate(_HTML_ESCAPE)
 
-    # Build the file timeline HTML
-    timeline_html = ""
-    for i, entry in enumerate(entries):
-        path = html.escape(entry.get("path", entry.get("operation", f"entry-{i}")))
-        y_hash = entry.get("y", entry.get("hash", ""))
-        x_hash = entry.get("x", "")
-        idx = entry.get("index", i)
-        ft = html.escape(entry.get("file_type", ""))
-        verified = entry.get("verified", True)
-        icon = "&#x2713;" if verified else "&#x2717;"
-        color = "#4ade80" if verified else "#f87171"
 
-        prev_line = ""
-        if i > 0:
-            prev_line = f'<div class="entry-prev">prev: {html.escape(x_hash[:24])}...</div>'
+def receipt_cache() -> TTLCache:
+    """Cache for rendered receipts, keyed on (id, chain head).
 
-        ft_badge = f'<span class="ft-badge">{ft}</span>' if ft else ""
+    Any new action moves the head, so stale HTML is only served for
+    tampering done outside the API, and then only until the TTL lapses.
+    """
+    return TTLCache(maxsize=4096, ttl=60)
 
-        timeline_html += f"""
-        <div class="entry" id="entry-{idx}" data-index="{idx}">
-          <div class="entry-header">
-            <span class="entry-icon" style="color:{color}">{icon}</span>
-            <span class="entry-idx">#{idx}</span>
-            {ft_badge}
-            <span class="entry-path">{path}</span>
-          </div>
-          <div class="entry-hash">hash: {html.escape(y_hash[:24])}...</div>
-          {prev_line}
-          <div class="entry-status" style="color:{color}">
-            {icon} {"verified" if verified else "BROKEN"}
-          </div>
-        </div>"""
-
-    # Build findings HTML
-    findings_html = ""
-    if findings:
-        for f in findings:
-            sev = f.get("severity", "info")
-            msg = html.escape(f.get("message", ""))
-            ftype = html.escape(f.get("type", ""))
-            sev_color = {"critical": "#f87171", "warning": "#fbbf24", "info": "#60a5fa"}.get(sev, "#60a5fa")
-            findings_html += f'<div class="finding" style="border-left:3px solid {sev_color}"><strong>{ftype}</strong>: {msg}</div>'
 
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>pruv scan receipt — {display_source}</title>
-<style>
-  * {{ margin:0; padding:0; box-sizing:border-box; }}
-  body {{
+def _script_json(value: Any) -> str:
+    """Serialize a value for embedding in an inline <script> block.
+
+    "<" is emitted as a JSON escape so values such as "</script>" cannot
+    close the block early.
+    """
+    return orjson.dumps(value).decode("utf-8").replace("<", "\\u003c")
+
+
+# Static parts of the receipt, built once at import rather than
+# re-formatted into the page on every render.
+_RECEIPT_STYLE = """  * { margin:0; padding:0; box-sizing:border-box; }
+  body {
     background:#0a0a0f;
     color:#e0e0e8;
     font-family:'JetBrains Mono','Fira Code','SF Mono',monospace;
     font-size:13px;
     line-height:1.6;
     padding:40px 20px;
-  }}
-  .container {{ max-width:720px; margin:0 auto; }}
-  h1 {{
+  }
+  .container { max-width:720px; margin:0 auto; }
+  h1 {
     font-size:18px;
     font-weight:600;
     color:#a78bfa;
     margin-bottom:8px;
     letter-spacing:-0.5px;
-  }}
-  h2 {{
+  }
+  h2 {
     font-size:14px;
     font-weight:600;
     color:#c0c0cc;
     margin:28px 0 12px;
     padding-bottom:8px;
     border-bottom:1px solid #1e1e2e;
-  }}
-  .meta {{
+  }
+  .meta {
     background:#111118;
     border:1px solid #1e1e2e;
     border-radius:8px;
     padding:16px 20px;
     margin:16px 0;
-  }}
-  .meta-row {{
+  }
+  .meta-row {
     display:flex;
     justify-content:space-between;
     padding:4px 0;
-  }}
-  .meta-label {{ color:#888; }}
-  .meta-value {{ color:#e0e0e8; }}
-  .status-badge {{
+  }
+  .meta-label { color:#888; }
+  .meta-value { color:#e0e0e8; }
+  .status-badge {
     display:inline-flex;
     align-items:center;
     gap:6px;
@@ -154,65 +96,65 @@ def generate_receipt_html(
     border-radius:20px;
     font-size:12px;
     font-weight:600;
-  }}
-  .status-ok {{ background:rgba(74,222,128,0.1); color:#4ade80; border:1px solid rgba(74,222,128,0.2); }}
-  .status-fail {{ background:rgba(248,113,113,0.1); color:#f87171; border:1px solid rgba(248,113,113,0.2); }}
-  .entry {{
+  }
+  .status-ok { background:rgba(74,222,128,0.1); color:#4ade80; border:1px solid rgba(74,222,128,0.2); }
+  .status-fail { background:rgba(248,113,113,0.1); color:#f87171; border:1px solid rgba(248,113,113,0.2); }
+  .entry {
     background:#111118;
     border:1px solid #1e1e2e;
     border-radius:6px;
     padding:12px 16px;
     margin:6px 0;
     transition:border-color 0.2s;
-  }}
-  .entry.broken {{ border-color:#f87171; }}
-  .entry-header {{
+  }
+  .entry.broken { border-color:#f87171; }
+  .entry-header {
     display:flex;
     align-items:center;
     gap:8px;
     margin-bottom:4px;
-  }}
-  .entry-icon {{ font-size:14px; }}
-  .entry-idx {{ color:#888; font-size:11px; min-width:32px; }}
-  .entry-path {{ color:#e0e0e8; flex:1; overflow:hidden; text-overflow:ellipsis; white-space:nowrap; }}
-  .entry-hash {{ color:#666; font-size:11px; margin-left:40px; }}
-  .entry-prev {{ color:#555; font-size:11px; margin-left:40px; }}
-  .entry-status {{ font-size:11px; margin-left:40px; margin-top:2px; }}
-  .ft-badge {{
+  }
+  .entry-icon { font-size:14px; }
+  .entry-idx { color:#888; font-size:11px; min-width:32px; }
+  .entry-path { color:#e0e0e8; flex:1; overflow:hidden; text-overflow:ellipsis; white-space:nowrap; }
+  .entry-hash { color:#666; font-size:11px; margin-left:40px; }
+  .entry-prev { color:#555; font-size:11px; margin-left:40px; }
+  .entry-status { font-size:11px; margin-left:40px; margin-top:2px; }
+  .ft-badge {
     font-size:10px;
     padding:1px 6px;
     border-radius:3px;
     background:#1a1a2e;
     border:1px solid #2a2a3e;
     color:#a78bfa;
-  }}
-  .finding {{
+  }
+  .finding {
     background:#111118;
     padding:8px 12px;
     margin:4px 0;
     border-radius:4px;
     font-size:12px;
-  }}
-  .proof-box {{
+  }
+  .proof-box {
     background:#111118;
     border:1px solid #1e1e2e;
     border-radius:8px;
     padding:16px 20px;
     margin:12px 0;
-  }}
-  .proof-row {{
+  }
+  .proof-row {
     display:flex;
     justify-content:space-between;
     padding:4px 0;
     font-size:12px;
-  }}
-  .proof-label {{ color:#888; }}
-  .proof-value {{ color:#a78bfa; font-size:11px; max-width:400px; overflow:hidden; text-overflow:ellipsis; }}
-  .verify-section {{
+  }
+  .proof-label { color:#888; }
+  .proof-value { color:#a78bfa; font-size:11px; max-width:400px; overflow:hidden; text-overflow:ellipsis; }
+  .verify-section {
     text-align:center;
     margin:32px 0;
-  }}
-  .verify-btn {{
+  }
+  .verify-btn {
     background:#7c3aed;
     color:#fff;
     border:none;
@@ -223,48 +165,245 @@ def generate_receipt_html(
     font-family:inherit;
     cursor:pointer;
     transition:background 0.2s;
-  }}
-  .verify-btn:hover {{ background:#6d28d9; }}
-  .verify-btn:disabled {{ opacity:0.5; cursor:not-allowed; }}
-  .verify-hint {{
+  }
+  .verify-btn:hover { background:#6d28d9; }
+  .verify-btn:disabled { opacity:0.5; cursor:not-allowed; }
+  .verify-hint {
     color:#555;
     font-size:11px;
     margin-top:8px;
-  }}
-  .verify-result {{
+  }
+  .verify-result {
     margin-top:16px;
     padding:12px 20px;
     border-radius:8px;
     font-size:13px;
     display:none;
-  }}
-  .verify-ok {{
+  }
+  .verify-ok {
     display:block;
     background:rgba(74,222,128,0.1);
     border:1px solid rgba(74,222,128,0.2);
     color:#4ade80;
-  }}
-  .verify-fail {{
+  }
+  .verify-fail {
     display:block;
     background:rgba(248,113,113,0.1);
     border:1px solid rgba(248,113,113,0.2);
     color:#f87171;
-  }}
-  .footer {{
+  }
+  .footer {
     text-align:center;
     margin-top:40px;
     padding-top:20px;
     border-top:1px solid #1e1e2e;
     color:#444;
     font-size:11px;
-  }}
-  .footer a {{ color:#7c3aed; text-decoration:none; }}
-  @media print {{
-    body {{ background:#fff; color:#111; }}
-    .entry, .meta, .proof-box {{ background:#f8f8f8; border-color:#ddd; }}
-    .verify-section {{ display:none; }}
-  }}
-</style>
+  }
+  .footer a { color:#7c3aed; text-decoration:none; }
+  @media print {
+    body { background:#fff; color:#111; }
+    .entry, .meta, .proof-box { background:#f8f8f8; border-color:#ddd; }
+    .verify-section { display:none; }
+  }
+"""
+
+_RECEIPT_SCRIPT = """
+// SHA-256 using Web Crypto API
+async function sha256(message) {
+  const encoder = new TextEncoder();
+  const data = encoder.encode(message);
+  const hashBuffer = await crypto.subtle.digest('SHA-256', data);
+  const hashArray = Array.from(new Uint8Array(hashBuffer));
+  return hashArray.map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Recompute XY proof: xy_SHA256("x:operation:y:timestamp")
+async function computeXY(x, operation, y, timestamp) {
+  const data = x + ':' + operation + ':' + y + ':' + timestamp;
+  const digest = await sha256(data);
+  return 'xy_' + digest;
+}
+
+async function verifyReceipt() {
+  const btn = document.getElementById('verifyBtn');
+  const resultDiv = document.getElementById('verifyResult');
+  btn.disabled = true;
+  btn.textContent = 'Verifying...';
+  resultDiv.style.display = 'none';
+  resultDiv.className = 'verify-result';
+
+  let allValid = true;
+  let breakIndex = -1;
+  const errors = [];
+
+  for (let i = 0; i < ENTRIES.length; i++) {
+    const entry = ENTRIES[i];
+    const entryEl = document.getElementById('entry-' + entry.index);
+
+    // 1. Check chain rule: first entry x must be GENESIS,
+    //    subsequent entries x must equal previous entry y
+    if (i === 0) {
+      if (entry.x !== 'GENESIS') {
+        allValid = false;
+        breakIndex = i;
+        errors.push('#' + entry.index + ': first entry x is not GENESIS');
+        if (entryEl) entryEl.classList.add('broken');
+        continue;
+      }
+    } else {
+      const prevY = ENTRIES[i - 1].y;
+      if (entry.x !== prevY) {
+        allValid = false;
+        breakIndex = i;
+        errors.push('#' + entry.index + ': x does not match previous y (chain broken)');
+        if (entryEl) entryEl.classList.add('broken');
+        continue;
+      }
+    }
+
+    // 2. Recompute XY proof
+    if (entry.xy && entry.operation && entry.timestamp) {
+      const expectedXY = await computeXY(entry.x, entry.operation, entry.y, entry.timestamp);
+      if (entry.xy !== expectedXY) {
+        allValid = false;
+        breakIndex = i;
+        errors.push('#' + entry.index + ': xy proof mismatch');
+        if (entryEl) entryEl.classList.add('broken');
+        continue;
+      }
+    }
+
+    // Mark verified
+    if (entryEl) {
+      const statusEl = entryEl.querySelector('.entry-status');
+      if (statusEl) {
+        statusEl.style.color = '#4ade80';
+        statusEl.innerHTML = '&#x2713; verified (re-checked)';
+      }
+    }
+  }
+
+  if (allValid) {
+    resultDiv.className = 'verify-result verify-ok';
+    resultDiv.innerHTML = '&#x2713; All ' + ENTRIES.length + ' entries verified. Chain is intact. Every hash matches.';
+  } else {
+    resultDiv.className = 'verify-result verify-fail';
+    resultDiv.innerHTML = '&#x2717; Verification failed at entry #' + breakIndex + '.<br>' + errors.join('<br>');
+  }
+
+  btn.disabled = false;
+  btn.textContent = allValid ? '\\u2713 Verified' : '\\u2717 Failed';
+}
+"""
+
+_SEVERITY_COLORS = {"critical": "#f87171", "warning": "#fbbf24", "info": "#60a5fa"}
+
+
+def generate_receipt_html(
+    scan_id: str,
+    source: str | None,
+    started_at: str,
+    completed_at: str | None,
+    entries: list[dict[str, Any]],
+    findings: list[dict[str, Any]],
+    summary: str | None,
+) -> str:
+    """Generate a self-contained HTML receipt for a scan.
+
+    The receipt includes:
+    - Scan metadata (source, time, file count, status)
+    - Every file entry with path, hash, chain position, verification status
+    - Chain proof data (root hash, head hash, entry count)
+    - A "Verify" button that recomputes all hashes client-side using
+      the Web Crypto API (SubtleCrypto SHA-256). No server needed.
+    """
+    total = len(entries)
+    # One pass over findings: count critical ones and render each row
+    critical_count = 0
+    finding_parts: list[str] = []
+    for f in findings:
+        sev = f.get("severity", "info")
+        if sev == "critical":
+            critical_count += 1
+        finding_parts.append(
+            f'<div class="finding" style="border-left:3px solid {_SEVERITY_COLORS.get(sev, "#60a5fa")}">'
+            f'<strong>{escape_html(f.get("type", ""))}</strong>: {escape_html(f.get("message", ""))}</div>'
+        )
+    findings_html = "".join(finding_parts)
+
+    all_verified = critical_count == 0
+    status_label = "all verified" if all_verified else f"{critical_count} integrity failure{'s' if critical_count != 1 else ''}"
+    status_icon = "&#x2713;" if all_verified else "&#x2717;"
+    status_color = "#4ade80" if all_verified else "#f87171"
+
+    root_hash = entries[0].get("y", entries[0].get("hash", "")) if entries else ""
+    head_hash = entries[-1].get("y", entries[-1].get("hash", "")) if entries else ""
+    root_xy = entries[0].get("xy", "") if entries else ""
+    head_xy = entries[-1].get("xy", "") if entries else ""
+
+    display_source = escape_html(source or "unknown")
+    display_started = escape_html(started_at or "")
+    display_summary = escape_html(summary or f"{total} files scanned")
+
+    # Build entries JSON for the JavaScript verifier
+    entries_json = _script_json([
+        {
+            "index": e.get("index", i),
+            "path": e.get("path") or e.get("operation") or f"entry-{i}",
+            "x": e.get("x", ""),
+            "y": e.get("y") or e.get("hash") or "",
+            "xy": e.get("xy", ""),
+            "operation": e.get("operation") or e.get("path") or "",
+            "timestamp": e.get("timestamp", 0),
+            "file_type": e.get("file_type", ""),
+            "size": e.get("size", 0),
+        }
+        for i, e in enumerate(entries)
+    ])
+
+    # Build the file timeline HTML
+    timeline_parts: list[str] = []
+    for i, entry in enumerate(entries):
+        path = escape_html(entry.get("path") or entry.get("operation") or f"entry-{i}")
+        y_hash = entry.get("y") or entry.get("hash") or ""
+        x_hash = entry.get("x", "")
+        idx = entry.get("index", i)
+        ft = escape_html(entry.get("file_type", ""))
+        verified = entry.get("verified", True)
+        icon = "&#x2713;" if verified else "&#x2717;"
+        color = "#4ade80" if verified else "#f87171"
+
+        prev_line = ""
+        if i > 0:
+            prev_line = f'<div class="entry-prev">prev: {escape_html(x_hash[:24])}...</div>'
+
+        ft_badge = f'<span class="ft-badge">{ft}</span>' if ft else ""
+
+        timeline_parts.append(f"""
+        <div class="entry" id="entry-{idx}" data-index="{idx}">
+          <div class="entry-header">
+            <span class="entry-icon" style="color:{color}">{icon}</span>
+            <span class="entry-idx">#{idx}</span>
+            {ft_badge}
+            <span class="entry-path">{path}</span>
+          </div>
+          <div class="entry-hash">hash: {escape_html(y_hash[:24])}...</div>
+          {prev_line}
+          <div class="entry-status" style="color:{color}">
+            {icon} {"verified" if verified else "BROKEN"}
+          </div>
+        </div>""")
+    timeline_html = "".join(timeline_parts)
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>pruv scan receipt — {display_source}</title>
+<style>
+{_RECEIPT_STYLE}</style>
 </head>
 <body>
 <div class="container">
@@ -293,7 +432,7 @@ def generate_receipt_html(
     </div>
     <div class="meta-row">
       <span class="meta-label">scan id</span>
-      <span class="meta-value">{html.escape(scan_id)}</span>
+      <span class="meta-value">{escape_html(scan_id)}</span>
     </div>
   </div>
 
@@ -306,11 +445,11 @@ def generate_receipt_html(
   <div class="proof-box">
     <div class="proof-row">
       <span class="proof-label">root hash</span>
-      <span class="proof-value">{html.escape(root_hash)}</span>
+      <span class="proof-value">{escape_html(root_hash)}</span>
     </div>
     <div class="proof-row">
       <span class="proof-label">head hash</span>
-      <span class="proof-value">{html.escape(head_hash)}</span>
+      <span class="proof-value">{escape_html(head_hash)}</span>
     </div>
     <div class="proof-row">
       <span class="proof-label">entries</span>
@@ -322,11 +461,11 @@ def generate_receipt_html(
     </div>
     <div class="proof-row">
       <span class="proof-label">root xy</span>
-      <span class="proof-value">{html.escape(root_xy)}</span>
+      <span class="proof-value">{escape_html(root_xy)}</span>
     </div>
     <div class="proof-row">
       <span class="proof-label">head xy</span>
-      <span class="proof-value">{html.escape(head_xy)}</span>
+      <span class="proof-value">{escape_html(head_xy)}</span>
     </div>
   </div>
 
@@ -348,93 +487,6 @@ def generate_receipt_html(
 <script>
 // Entry data embedded in the receipt for client-side verification
 const ENTRIES = {entries_json};
-
-// SHA-256 using Web Crypto API
-async function sha256(message) {{
-  const encoder = new TextEncoder();
-  const data = encoder.encode(message);
-  const hashBuffer = await crypto.subtle.digest('SHA-256', data);
-  const hashArray = Array.from(new Uint8Array(hashBuffer));
-  return hashArray.map(b => b.toString(16).padStart(2, '0')).join('');
-}}
-
-// Recompute XY proof: xy_SHA256("x:operation:y:timestamp")
-async function computeXY(x, operation, y, timestamp) {{
-  const data = x + ':' + operation + ':' + y + ':' + timestamp;
-  const digest = await sha256(data);
-  return 'xy_' + digest;
-}}
-
-async function verifyReceipt() {{
-  const btn = document.getElementById('verifyBtn');
-  const resultDiv = document.getElementById('verifyResult');
-  btn.disabled = true;
-  btn.textContent = 'Verifying...';
-  resultDiv.style.display = 'none';
-  resultDiv.className = 'verify-result';
-
-  let allValid = true;
-  let breakIndex = -1;
-  const errors = [];
-
-  for (let i = 0; i < ENTRIES.length; i++) {{
-    const entry = ENTRIES[i];
-    const entryEl = document.getElementById('entry-' + entry.index);
-
-    // 1. Check chain rule: first entry x must be GENESIS,
-    //    subsequent entries x must equal previous entry y
-    if (i === 0) {{
-      if (entry.x !== 'GENESIS') {{
-        allValid = false;
-        breakIndex = i;
-        errors.push('#' + entry.index + ': first entry x is not GENESIS');
-        if (entryEl) entryEl.classList.add('broken');
-        continue;
-      }}
-    }} else {{
-      const prevY = ENTRIES[i - 1].y;
-      if (entry.x !== prevY) {{
-        allValid = false;
-        breakIndex = i;
-        errors.push('#' + entry.index + ': x does not match previous y (chain broken)');
-        if (entryEl) entryEl.classList.add('broken');
-        continue;
-      }}
-    }}
-
-    // 2. Recompute XY proof
-    if (entry.xy && entry.operation && entry.timestamp) {{
-      const expectedXY = await computeXY(entry.x, entry.operation, entry.y, entry.timestamp);
-      if (entry.xy !== expectedXY) {{
-        allValid = false;
-        breakIndex = i;
-        errors.push('#' + entry.index + ': xy proof mismatch');
-        if (entryEl) entryEl.classList.add('broken');
-        continue;
-      }}
-    }}
-
-    // Mark verified
-    if (entryEl) {{
-      const statusEl = entryEl.querySelector('.entry-status');
-      if (statusEl) {{
-        statusEl.style.color = '#4ade80';
-        statusEl.innerHTML = '&#x2713; verified (re-checked)';
-      }}
-    }}
-  }}
-
-  if (allValid) {{
-    resultDiv.className = 'verify-result verify-ok';
-    resultDiv.innerHTML = '&#x2713; All ' + ENTRIES.length + ' entries verified. Chain is intact. Every hash matches.';
-  }} else {{
-    resultDiv.className = 'verify-result verify-fail';
-    resultDiv.innerHTML = '&#x2717; Verification failed at entry #' + breakIndex + '.<br>' + errors.join('<br>');
-  }}
-
-  btn.disabled = false;
-  btn.textContent = allValid ? '\\u2713 Verified' : '\\u2717 Failed';
-}}
-</script>
+{_RECEIPT_SCRIPT}</script>
 </body>
 </html>"""
@@ -13,8 +13,10 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session, sessionmaker
 
+from ..core.config import settings
 from ..models.database import Base, Receipt, get_engine
 from .chain_service import chain_service
 
@@ -60,7 +62,7 @@ class ReceiptService:
 
     def _session(self) -> Session:
         if not self._session_factory:
-            self.init_db("sqlite:///pruv_dev.db")
+            self.init_db(settings.effective_database_url)
         return self._session_factory()
 
     def create_receipt(
@@ -141,12 +143,16 @@ class ReceiptService:
                 return None
             return _receipt_to_dict(receipt)
 
-    def list_receipts(self, user_id: str) -> list[dict[str, Any]]:
+    def list_receipts(
+        self, user_id: str, limit: int = 50, offset: int = 0
+    ) -> list[dict[str, Any]]:
         with self._session() as session:
             receipts = (
                 session.query(Receipt)
                 .filter(Receipt.user_id == user_id)
                 .order_by(Receipt.created_at.desc())
+                .offset(offset)
+                .limit(limit)
                 .all()
             )
             return [_receipt_to_dict(r) for r in receipts]
@@ -155,15 +161,34 @@ class ReceiptService:
         with self._session() as session:
             return session.query(Receipt).filter(Receipt.user_id == user_id).count()
 
+    def get_listing_version(self, user_id: str) -> str:
+        """Return a tag that changes whenever the user's receipts change.
+
+        Receipts are immutable, so the count and newest creation time
+        are enough to detect any change.
+        """
+        with self._session() as session:
+            count, last_created = (
+                session.query(func.count(Receipt.id), func.max(Receipt.created_at))
+                .filter(Receipt.user_id == user_id)
+                .one()
+            )
+            return f"{count}:{last_created}"
+
     def get_receipt_pdf_data(self, receipt_id: str) -> dict[str, Any] | None:
         receipt = self.get_receipt(receipt_id)
         if not receipt:
             return None
-        return {
-            "receipt": receipt,
-            "format": "pdf",
-            "generated_at": time.time(),
-        }
+        return _pdf_data(receipt)
+
+    def get_receipt_pdf_data_for_user(
+        self, receipt_id: str, user_id: str
+    ) -> dict[str, Any] | None:
+        """Authorize and build PDF export data from a single receipt read."""
+        receipt = self.get_receipt_for_user(receipt_id, user_id)
+        if not receipt:
+            return None
+        return _pdf_data(receipt)
 
     def get_receipt_badge(self, receipt_id: str) -> dict[str, Any] | None:
         receipt = self.get_receipt(receipt_id)
@@ -178,7 +203,15 @@ class ReceiptService:
         }
 
 
-def _generate_badge_svg(verified: bool, entry_count: int) -> str:
+def _pdf_data(receipt: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "receipt": receipt,
+        "format": "pdf",
+        "generated_at": time.time(),
+    }
+
+
+def _render_badge_svg(verified: bool) -> str:
     color = "#22c55e" if verified else "#ef4444"
     status = "verified" if verified else "unverified"
     return (
@@ -193,5 +226,13 @@ def _generate_badge_svg(verified: bool, entry_count: int) -> str:
     )
 
 
+# The badge only varies by verification status, so both are built once.
+_BADGE_SVG = {True: _render_badge_svg(True), False: _render_badge_svg(False)}
+
+
+def _generate_badge_svg(verified: bool, entry_count: int) -> str:
+    return _BADGE_SVG[bool(verified)]
+
+
 # Global instance
 receipt_service = ReceiptService()
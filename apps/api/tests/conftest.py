@@ -0,0 +1,22 @@
+"""Shared test setup: keep the test database out of the working tree.
+
+DATABASE_URL must be set before app.core.config is first imported. An
+in-memory "sqlite://" URL would give every thread (scan writer, verify
+pool) its own empty database, so the tests use a file in a temp dir.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="pruv-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'pruv_test.db')}"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    from app.models.database import dispose_engines
+
+    dispose_engines()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
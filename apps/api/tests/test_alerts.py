@@ -11,6 +11,7 @@ from app.main import app
 from app.core.security import generate_api_key
 from app.services.alerts import (
     AlertSeverity,
+    _extract_domain,
     analyze_chain,
 )
 
@@ -199,6 +200,76 @@ class TestNewDomains:
         assert len(domain_alerts) >= 1
         assert domain_alerts[0].severity == AlertSeverity.INFO
 
+    @pytest.mark.parametrize("url", [
+        "https://api.openai.com/v1/chat",
+        "https://API.Stripe.com?x=1",
+        "https://evil.example.com#frag",
+        "https://user:pw@evil.example.com/exfil",
+        "https://evil.example.com:8443/exfil",
+        "http://[::1]:8080/",
+        "http://[fe80::1%25ETH0]/",
+        "//cdn.example.com/lib.js",
+        "  https://padded.example.com/  ",
+        "https://tab\tbed.example.com/",
+        "HTTPS://Upper.Example.com",
+        "1http://bad-scheme.example.com",
+        "mailto:someone@example.com",
+        "api.example.com/no-scheme",
+        "",
+    ])
+    def test_domain_matches_urlsplit_hostname(self, url):
+        from urllib.parse import urlsplit
+
+        assert _extract_domain(url) == (urlsplit(url.strip()).hostname or "")
+
+    def test_port_and_userinfo_do_not_make_a_new_domain(self):
+        chain = _make_chain()
+        entries = [
+            _make_entry(0, "api.call", metadata={"url": "https://api.openai.com/v1/chat"}),
+            _make_entry(1, "api.call", metadata={"url": "https://api.stripe.com/v1/charges"}),
+            _make_entry(2, "api.call", metadata={"url": "https://api.github.com/repos"}),
+            _make_entry(3, "api.call", metadata={"url": "https://API.GitHub.com:443/user"}),
+            _make_entry(4, "api.call", metadata={"url": "https://bot@api.stripe.com/v1"}),
+        ]
+        alerts = analyze_chain(chain, entries)
+        assert [a for a in alerts if a.rule == "new_api_domain"] == []
+
+
+class TestRuleOrdering:
+    def test_alerts_grouped_by_rule(self):
+        """Interleaved entries still yield alerts in rule order."""
+        chain = _make_chain()
+        entries = [_make_entry(0, "tool.error")]
+        for i, host in enumerate(["a.com", "b.com", "c.com", "d.com"], start=1):
+            entries.append(
+                _make_entry(i, "api.call", metadata={"url": f"https://{host}/"})
+            )
+        entries.append(_make_entry(5, "file.access", metadata={"path": "/app/.env"}))
+        entries.append(_make_entry(6, "action.error"))
+        entries.append(_make_entry(7, "action.error"))
+        alerts = analyze_chain(chain, entries)
+        assert [a.rule for a in alerts] == [
+            "high_error_rate",
+            "sensitive_file_access",
+            "new_api_domain",
+        ]
+
+    def test_operation_matching_two_rules_runs_both(self):
+        """Each rule checks the operation on its own."""
+        chain = _make_chain()
+        entries = [
+            _make_entry(i, "tool.start", metadata={"tool": f"tool-{i}"})
+            for i in range(4)
+        ]
+        entries.append(_make_entry(
+            4,
+            "tool.start.file.access",
+            metadata={"tool": "reader", "path": "/app/.env"},
+        ))
+        alerts = analyze_chain(chain, entries)
+        assert [a.rule for a in alerts] == ["new_tool", "sensitive_file_access"]
+        assert {a.entry_id for a in alerts} == {"entry-4"}
+
 
 class TestEmptyChain:
     def test_no_alerts_on_empty(self):
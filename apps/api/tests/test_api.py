@@ -271,3 +271,370 @@ class TestAutoRedact:
         data = resp.json()
         assert data["y_state"]["password"] == "[REDACTED]"
         assert data["y_state"]["api_key"] == "[REDACTED]"
+
+
+class TestJSONColumns:
+    def test_large_integers_round_trip(self):
+        headers = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        create_resp = client.post(
+            "/v1/chains", json={"name": "bigint-test"}, headers=headers,
+        )
+        chain_id = create_resp.json()["id"]
+        client.post(
+            f"/v1/chains/{chain_id}/entries",
+            json={"operation": "count", "y_state": {"total": 10**30, "ratio": 0.5}},
+            headers=headers,
+        )
+        resp = client.get(f"/v1/chains/{chain_id}/entries", headers=headers)
+        entries = resp.json()["entries"]
+        assert entries[0]["y_state"] == {"total": 10**30, "ratio": 0.5}
+
+
+class TestListingPagination:
+    def _fresh_auth(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+
+    def test_identities_paginated_with_total(self):
+        auth = self._fresh_auth()
+        for i in range(3):
+            client.post(
+                "/v1/identity/register", json={"name": f"agent-{i}"}, headers=auth,
+            )
+        resp = client.get("/v1/identity?limit=2&offset=0", headers=auth)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data["identities"]) == 2
+        assert data["total"] == 3
+        assert data["limit"] == 2
+        assert data["offset"] == 0
+
+        resp = client.get("/v1/identity?limit=2&offset=2", headers=auth)
+        assert len(resp.json()["identities"]) == 1
+
+    def test_artifacts_paginated_with_total(self):
+        import uuid
+
+        auth = self._fresh_auth()
+        for i in range(3):
+            client.post(
+                "/v1/provenance/origin",
+                json={
+                    "content_hash": uuid.uuid4().hex,
+                    "name": f"doc-{i}",
+                    "creator": "tester",
+                },
+                headers=auth,
+            )
+        resp = client.get("/v1/provenance?limit=1&offset=1", headers=auth)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data["artifacts"]) == 1
+        assert data["total"] == 3
+        assert data["offset"] == 1
+
+    def test_listing_etag_returns_304_until_changed(self):
+        auth = self._fresh_auth()
+        client.post("/v1/identity/register", json={"name": "etag-a"}, headers=auth)
+        resp = client.get("/v1/identity", headers=auth)
+        etag = resp.headers["ETag"]
+
+        resp = client.get("/v1/identity", headers={**auth, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+        client.post("/v1/identity/register", json={"name": "etag-b"}, headers=auth)
+        resp = client.get("/v1/identity", headers={**auth, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+        assert resp.json()["total"] == 2
+
+    def test_listing_etag_varies_by_page(self):
+        auth = self._fresh_auth()
+        first = client.get("/v1/receipts?limit=10", headers=auth).headers["ETag"]
+        second = client.get("/v1/receipts?limit=20", headers=auth).headers["ETag"]
+        assert first != second
+
+    def test_receipts_limit_bounds(self):
+        resp = client.get("/v1/receipts?limit=0", headers=AUTH_HEADER)
+        assert resp.status_code == 422
+
+
+class TestReceiptSnapshots:
+    def test_identity_receipt_renders_verified(self):
+        resp = client.post(
+            "/v1/identity/register", json={"name": "snap-agent"}, headers=AUTH_HEADER,
+        )
+        identity_id = resp.json()["id"]
+        client.post(
+            f"/v1/identity/{identity_id}/act",
+            json={"action": "file.read"},
+            headers=AUTH_HEADER,
+        )
+        resp = client.get(f"/v1/identity/{identity_id}/receipt", headers=AUTH_HEADER)
+        assert resp.status_code == 200
+        assert "VERIFIED" in resp.text
+        assert "file.read" in resp.text
+
+    def test_identity_receipt_reflects_new_actions(self):
+        headers = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        resp = client.post(
+            "/v1/identity/register", json={"name": "cached-agent"}, headers=headers,
+        )
+        identity_id = resp.json()["id"]
+        first = client.get(f"/v1/identity/{identity_id}/receipt", headers=headers)
+        assert "net.fetch" not in first.text
+        client.post(
+            f"/v1/identity/{identity_id}/act",
+            json={"action": "net.fetch"},
+            headers=headers,
+        )
+        second = client.get(f"/v1/identity/{identity_id}/receipt", headers=headers)
+        assert "net.fetch" in second.text
+
+    def test_identity_receipt_not_found(self):
+        resp = client.get(f"/v1/identity/pi_{'0' * 40}/receipt", headers=AUTH_HEADER)
+        assert resp.status_code == 404
+
+    def test_malformed_identity_id_rejected(self):
+        resp = client.get("/v1/identity/pi_missing/receipt", headers=AUTH_HEADER)
+        assert resp.status_code == 422
+        resp = client.get("/v1/identity/not-an-id", headers=AUTH_HEADER)
+        assert resp.status_code == 422
+
+    def test_provenance_receipt_renders_verified(self):
+        import uuid
+
+        resp = client.post(
+            "/v1/provenance/origin",
+            json={
+                "content_hash": uuid.uuid4().hex,
+                "name": "snap-doc",
+                "creator": "tester",
+            },
+            headers=AUTH_HEADER,
+        )
+        artifact_id = resp.json()["id"]
+        client.post(
+            f"/v1/provenance/{artifact_id}/transition",
+            json={"new_hash": uuid.uuid4().hex, "modifier": "editor"},
+            headers=AUTH_HEADER,
+        )
+        resp = client.get(f"/v1/provenance/{artifact_id}/receipt", headers=AUTH_HEADER)
+        assert resp.status_code == 200
+        assert "VERIFIED" in resp.text
+        assert "editor" in resp.text
+
+
+class TestReceiptEscaping:
+    def test_escape_html_matches_stdlib(self):
+        import html
+
+        from app.services.receipt_html import escape_html
+
+        for text in ["plain", "", "<script>alert('x')</script>", 'a & "b"']:
+            assert escape_html(text) == html.escape(text)
+
+    def test_scan_receipt_script_data_cannot_close_block(self):
+        from app.services.receipt_html import generate_receipt_html
+
+        html = generate_receipt_html(
+            scan_id="s1",
+            source="upload",
+            started_at="2026-01-01T00:00:00Z",
+            completed_at=None,
+            entries=[{"path": "</script><script>alert(1)</script>", "x": "GENESIS", "y": "a"}],
+            findings=[],
+            summary=None,
+        )
+        assert html.count("</script>") == 1
+        assert "\\u003c/script>" in html
+
+    def test_identity_receipt_escapes_name(self):
+        resp = client.post(
+            "/v1/identity/register",
+            json={"name": "<b>evil</b>"},
+            headers=AUTH_HEADER,
+        )
+        identity_id = resp.json()["id"]
+        resp = client.get(f"/v1/identity/{identity_id}/receipt", headers=AUTH_HEADER)
+        assert "&lt;b&gt;evil&lt;/b&gt;" in resp.text
+        assert "<b>evil</b>" not in resp.text
+
+
+class TestVerificationCache:
+    def test_ttl_cache_evicts_oldest_and_expires(self):
+        from app.core.cache import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+
+        expired = TTLCache(maxsize=2, ttl=0)
+        expired.set("a", 1)
+        assert expired.get("a") is None
+
+    def test_identity_verify_refreshes_after_action(self):
+        resp = client.post(
+            "/v1/identity/register", json={"name": "cache-agent"}, headers=AUTH_HEADER,
+        )
+        identity_id = resp.json()["id"]
+        first = client.get(f"/v1/identity/{identity_id}/verify", headers=AUTH_HEADER)
+        again = client.get(f"/v1/identity/{identity_id}/verify", headers=AUTH_HEADER)
+        assert first.json() == again.json()
+        assert first.json()["action_count"] == 0
+
+        client.post(
+            f"/v1/identity/{identity_id}/act",
+            json={"action": "deploy"},
+            headers=AUTH_HEADER,
+        )
+        resp = client.get(f"/v1/identity/{identity_id}/verify", headers=AUTH_HEADER)
+        assert resp.json()["action_count"] == 1
+        assert resp.json()["valid"] is True
+
+    def test_identity_snapshot_append_between_reads(self, monkeypatch):
+        from app.services.chain_service import chain_service
+        from app.services.identity_service import identity_service
+
+        auth = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        resp = client.post(
+            "/v1/identity/register", json={"name": "race-agent"}, headers=auth,
+        )
+        identity_id = resp.json()["id"]
+        list_entries = chain_service.list_entries
+        appended = []
+
+        def list_then_append(*args, **kwargs):
+            entries = list_entries(*args, **kwargs)
+            if not appended:
+                appended.append(True)
+                client.post(
+                    f"/v1/identity/{identity_id}/act",
+                    json={"action": "deploy"},
+                    headers=auth,
+                )
+            return entries
+
+        monkeypatch.setattr(chain_service, "list_entries", list_then_append)
+        identity_service.render_snapshot(identity_id)
+        monkeypatch.undo()
+        assert identity_service.verify(identity_id)["action_count"] == 1
+
+    def test_provenance_snapshot_append_between_reads(self, monkeypatch):
+        import uuid
+
+        from app.services.chain_service import chain_service
+        from app.services.provenance_service import provenance_service
+
+        auth = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        resp = client.post(
+            "/v1/provenance/origin",
+            json={"content_hash": uuid.uuid4().hex, "name": "race.bin", "creator": "tester"},
+            headers=auth,
+        )
+        artifact = resp.json()
+        list_entries = chain_service.list_entries
+        appended = []
+
+        def list_then_append(*args, **kwargs):
+            entries = list_entries(*args, **kwargs)
+            if not appended:
+                appended.append(True)
+                client.post(
+                    f"/v1/provenance/{artifact['id']}/transition",
+                    json={"new_hash": uuid.uuid4().hex, "modifier": "tester"},
+                    headers=auth,
+                )
+            return entries
+
+        monkeypatch.setattr(chain_service, "list_entries", list_then_append)
+        provenance_service.render_snapshot(artifact["id"])
+        monkeypatch.undo()
+        assert provenance_service.verify(artifact["id"])["transition_count"] == 1
+
+
+class TestReadResponses:
+    def test_identity_get_returns_service_shape(self):
+        resp = client.post(
+            "/v1/identity/register", json={"name": "shape-agent"}, headers=AUTH_HEADER,
+        )
+        identity_id = resp.json()["id"]
+        resp = client.get(f"/v1/identity/{identity_id}", headers=AUTH_HEADER)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert data["name"] == "shape-agent"
+        assert "T" in data["registered_at"]
+
+    def test_wide_integers_in_identity_metadata(self):
+        auth = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        resp = client.post(
+            "/v1/identity/register",
+            json={"name": "wide-int-agent", "metadata": {"n": 2**70}},
+            headers=auth,
+        )
+        assert resp.status_code == 200
+        assert resp.json()["metadata"] == {"n": 2**70}
+        identity_id = resp.json()["id"]
+
+        resp = client.post(
+            f"/v1/identity/{identity_id}/act",
+            json={"action": "count", "data": {"n": 2**70}},
+            headers=auth,
+        )
+        assert resp.status_code == 200
+        resp = client.get(f"/v1/identity/{identity_id}/history", headers=auth)
+        assert resp.status_code == 200
+
+    def test_wide_integers_in_provenance_metadata(self):
+        import uuid
+
+        auth = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        resp = client.post(
+            "/v1/provenance/origin",
+            json={
+                "content_hash": uuid.uuid4().hex,
+                "name": "wide.bin",
+                "creator": "tester",
+                "metadata": {"n": 2**70},
+            },
+            headers=auth,
+        )
+        assert resp.status_code == 200
+        artifact_id = resp.json()["id"]
+
+        resp = client.post(
+            f"/v1/provenance/{artifact_id}/transition",
+            json={"new_hash": uuid.uuid4().hex, "modifier": "tester", "metadata": {"n": 2**70}},
+            headers=auth,
+        )
+        assert resp.status_code == 200
+        resp = client.get(f"/v1/provenance/{artifact_id}/history", headers=auth)
+        assert resp.status_code == 200
+
+    def test_list_routes_keep_schema_shape(self):
+        auth = {"Authorization": f"Bearer {generate_api_key('pv_test_')}"}
+        create_resp = client.post(
+            "/v1/chains", json={"name": "adapter-shape"}, headers=auth,
+        )
+        chain_id = create_resp.json()["id"]
+        client.post(
+            f"/v1/chains/{chain_id}/entries",
+            json={"operation": "step"},
+            headers=auth,
+        )
+
+        resp = client.get("/v1/chains", headers=auth)
+        chain = next(c for c in resp.json()["chains"] if c["id"] == chain_id)
+        assert "user_id" not in chain
+        assert "T" in chain["created_at"]
+
+        resp = client.get(f"/v1/chains/{chain_id}/entries", headers=auth)
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert data["total"] == 1
+        assert "chain_id" not in data["entries"][0]
+        assert data["entries"][0]["metadata"] == {}
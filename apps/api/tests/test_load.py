@@ -30,7 +30,7 @@ from app.core.rate_limit import PLAN_LIMITS, rate_limiter
 from app.core.security import create_jwt_token
 from app.main import app
 from app.middleware.logging import _MAX_LOG_BUFFER, _request_log_buffer
-from app.models.database import Base, get_engine, get_session_factory
+from app.models.database import Base, dispose_engines, get_engine, get_session_factory
 from app.services.chain_service import chain_service
 
 
@@ -295,6 +295,7 @@ class TestConnectionPoolBehavior:
     """SQLAlchemy connection pool under concurrent access."""
 
     def teardown_method(self):
+        dispose_engines()
         _cleanup_db()
 
     def test_concurrent_sessions_within_pool(self):
@@ -363,6 +364,21 @@ class TestConnectionPoolBehavior:
             assert result.scalar() == 1
         engine.dispose()
 
+    def test_engine_shared_per_url(self):
+        """Services initialized against the same URL share one engine."""
+        url = f"sqlite:///{_SQLITE_PATH}"
+        assert get_engine(url) is get_engine(url)
+        assert get_engine(url) is not get_engine(url, pool_size=5)
+
+    def test_dispose_engines_releases_registry(self):
+        """dispose_engines closes cached engines; the next call builds anew."""
+        url = f"sqlite:///{_SQLITE_PATH}"
+        engine = get_engine(url)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        dispose_engines()
+        assert get_engine(url) is not engine
+
     def test_session_factory_creates_sessions(self):
         """get_session_factory should return a working sessionmaker."""
         factory = get_session_factory(f"sqlite:///{_SQLITE_PATH}")
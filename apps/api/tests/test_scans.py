@@ -55,6 +55,19 @@ class TestScanByChainId:
         assert data["started_at"]
         assert data["completed_at"]
 
+    def test_scan_response_matches_schema(self, monkeypatch):
+        from app.routes import scans
+
+        monkeypatch.setattr(scans, "_verify_entries", lambda *a, **k: [{
+            "severity": "warning", "type": "t", "message": "m", "entry_index": 0,
+        }])
+        chain_id = _create_chain_with_entries()
+        data = client.post(
+            "/v1/scans?force=1", json={"chain_id": chain_id}, headers=AUTH_HEADER,
+        ).json()
+        assert data["findings"][0]["details"] == {}
+        assert scans.ScanResponse.model_validate(data).model_dump() == data
+
     def test_scan_chain_not_found(self):
         resp = client.post(
             "/v1/scans",
@@ -97,6 +110,102 @@ class TestScanByChainId:
         assert data["findings"] == []
 
 
+class TestIncrementalScan:
+    def test_rescan_skips_verified_prefix_unless_forced(self, monkeypatch):
+        from app.routes import scans
+        from app.services.chain_service import chain_service
+
+        chain_id = _create_chain_with_entries()
+        client.post("/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        assert chain_service.get_scan_target(chain_id)[1]["index"] == 1
+
+        client.post(
+            f"/v1/chains/{chain_id}/entries",
+            json={"operation": "append", "x_state": {"v": 3}, "y_state": {"v": 4}},
+            headers=AUTH_HEADER,
+        )
+        verified = []
+        real_verify = scans._verify_entries
+
+        def spy(entries, deep_verify, check_signatures, start, stop, first_index, *rest):
+            verified.extend(range(first_index + start, first_index + len(entries)))
+            return real_verify(
+                entries, deep_verify, check_signatures, start, stop, first_index, *rest,
+            )
+
+        monkeypatch.setattr(scans, "_verify_entries", spy)
+        resp = client.post("/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        assert resp.json()["findings"] == []
+        assert verified == [2]
+        assert chain_service.get_scan_target(chain_id)[1]["index"] == 2
+
+        verified.clear()
+        client.post("/v1/scans?force=1", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        assert verified == [0, 1, 2]
+
+    def test_tamper_inside_verified_prefix_is_detected(self):
+        from app.models.database import Entry
+        from app.services.chain_service import chain_service
+
+        chain_id = _create_chain_with_entries()
+        client.post("/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        assert chain_service.get_scan_target(chain_id)[1]["index"] == 1
+
+        with chain_service._session() as session:
+            session.query(Entry).filter(
+                Entry.chain_id == chain_id, Entry.index == 0
+            ).update({"xy": "xy_" + "0" * 64})
+            session.commit()
+
+        resp = client.post("/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        findings = resp.json()["findings"]
+        assert [(f["type"], f["entry_index"]) for f in findings] == [("proof_mismatch", 0)]
+
+    def test_light_scan_does_not_record_prefix(self):
+        from app.services.chain_service import chain_service
+
+        chain_id = _create_chain_with_entries()
+        client.post(
+            "/v1/scans",
+            json={"chain_id": chain_id, "options": {"check_signatures": False}},
+            headers=AUTH_HEADER,
+        )
+        assert chain_service.get_scan_target(chain_id)[1] is None
+
+    def test_scan_target_checks_owner_and_reads_prefix(self):
+        from app.services.chain_service import chain_service
+
+        chain_id = _create_chain_with_entries()
+        owner = chain_service.get_chain(chain_id)["user_id"]
+        assert chain_service.get_scan_target(chain_id, owner) == (True, None)
+        assert chain_service.get_scan_target(chain_id, "someone-else") == (False, None)
+        assert chain_service.get_scan_target("000000000000") == (False, None)
+
+        client.post("/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        found, prefix = chain_service.get_scan_target(chain_id, owner)
+        assert found and prefix["index"] == 1 and len(prefix["digest"]) == 64
+
+    def test_stored_chain_streamed_across_chunks(self, monkeypatch):
+        from app.models.database import Entry
+        from app.routes import scans
+        from app.services.chain_service import chain_service
+
+        monkeypatch.setattr(scans, "VERIFY_CHUNK_SIZE", 1)
+        chain_id = _create_chain_with_entries()
+        with chain_service._session() as session:
+            session.query(Entry).filter(
+                Entry.chain_id == chain_id, Entry.index == 1
+            ).update({"xy": "xy_" + "0" * 64})
+            session.commit()
+
+        resp = client.post("/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER)
+        data = resp.json()
+        assert [(f["type"], f["entry_index"]) for f in data["findings"]] == [
+            ("proof_mismatch", 1)
+        ]
+        assert chain_service.get_scan_target(chain_id)[1] is None
+
+
 class TestScanByFileUpload:
     def test_upload_valid_file(self):
         # Build a valid chain JSON file
@@ -169,6 +278,302 @@ class TestScanByFileUpload:
         )
         assert resp.status_code == 400
 
+    def test_form_without_file_or_chain_id(self):
+        resp = client.post(
+            "/v1/scans",
+            data={"options": json.dumps({"deep_verify": False})},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 400
+
+    def test_oversized_options_rejected(self):
+        file_data = {"chain_id": "opts", "entries": []}
+        resp = client.post(
+            "/v1/scans",
+            data={"options": "x" * (16 * 1024 + 1)},
+            files={"file": ("chain.json", json.dumps(file_data).encode(), "application/json")},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 413
+
+    def test_oversized_upload_rejected(self, monkeypatch):
+        from app.routes import scans
+
+        monkeypatch.setattr(scans, "MAX_UPLOAD_SIZE", 1024)
+        monkeypatch.setattr(scans, "UPLOAD_READ_CHUNK", 256)
+        file_data = {"chain_id": "big", "entries": [], "pad": "x" * 2048}
+        resp = client.post(
+            "/v1/scans",
+            files={"file": ("chain.json", json.dumps(file_data).encode(), "application/json")},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 413
+
+    def test_oversized_content_length_rejected(self):
+        resp = client.post(
+            "/v1/scans",
+            content=b"",
+            headers={
+                **AUTH_HEADER,
+                "Content-Type": "multipart/form-data; boundary=x",
+                "Content-Length": str(1 << 40),
+            },
+        )
+        assert resp.status_code == 413
+
+    def test_malformed_options_use_defaults(self):
+        file_data = {"chain_id": "opts", "entries": []}
+        resp = client.post(
+            "/v1/scans",
+            data={"options": "not json"},
+            files={"file": ("chain.json", json.dumps(file_data).encode(), "application/json")},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 200
+
+
+class TestSignatureVerification:
+    def test_invalid_signature_reported_per_entry(self):
+        from xycore import XYEntry
+        from xycore.crypto import compute_xy, hash_state
+        from xycore.signature import generate_keypair, sign_entry
+
+        from app.routes.scans import _verify_entries
+
+        try:
+            private_key, _ = generate_keypair()
+        except ImportError:
+            pytest.skip("no Ed25519 backend installed")
+        entries = []
+        x = "GENESIS"
+        for i, ts in enumerate((1000.0, 1001.0, 1002.0)):
+            y = hash_state({"v": i})
+            entry = XYEntry(
+                index=i, timestamp=ts, operation="op", x=x, y=y,
+                xy=compute_xy(x, "op", y, ts), status="success",
+            )
+            sign_entry(entry, private_key)
+            entries.append({
+                "x": entry.x, "y": entry.y, "xy": entry.xy,
+                "operation": entry.operation, "timestamp": ts,
+                "signature": entry.signature, "public_key": entry.public_key,
+            })
+            x = y
+        entries[1]["signature"] = entries[0]["signature"]
+
+        findings = _verify_entries(entries, check_signatures=True)
+        assert [(f["type"], f["entry_index"]) for f in findings] == [
+            ("signature_invalid", 1),
+        ]
+
+
+class TestChunkedVerification:
+    def test_break_at_chunk_boundary_detected(self):
+        import asyncio
+
+        from xycore.crypto import compute_xy, hash_state
+
+        from app.routes.scans import VERIFY_CHUNK_SIZE, _verify_entries_async
+
+        entries = []
+        x = "GENESIS"
+        for i in range(VERIFY_CHUNK_SIZE * 2 + 3):
+            y = hash_state({"v": i})
+            ts = 1000.0 + i
+            entries.append({
+                "x": x, "y": y, "xy": compute_xy(x, "op", y, ts),
+                "operation": "op", "timestamp": ts,
+            })
+            x = y
+        assert asyncio.run(_verify_entries_async(entries)) == []
+
+        entries[VERIFY_CHUNK_SIZE]["x"] = "tampered"
+        findings = asyncio.run(_verify_entries_async(entries))
+        assert {(f["type"], f["entry_index"]) for f in findings} == {
+            ("chain_break", VERIFY_CHUNK_SIZE),
+            ("proof_mismatch", VERIFY_CHUNK_SIZE),
+        }
+
+
+class TestProofVerification:
+    def test_chain_rule_only_scan_skips_proofs(self):
+        from app.routes.scans import _verify_entries
+
+        entries = [
+            {"x": "GENESIS", "y": "a", "xy": "xy_bad", "operation": "op", "timestamp": 1.0},
+            {"x": "other", "y": "b", "xy": "xy_bad", "operation": "op", "timestamp": 2.0},
+        ]
+        findings = _verify_entries(entries, deep_verify=False)
+        assert [(f["type"], f["entry_index"]) for f in findings] == [("chain_break", 1)]
+
+    def test_unhashable_fields_reported_not_raised(self):
+        from app.routes.scans import _verify_entries
+
+        entries = [
+            {"x": ["GENESIS"], "y": {"v": 1}, "xy": "xy_0", "operation": "init", "timestamp": 1000.0},
+        ]
+        types = [f["type"] for f in _verify_entries(entries)]
+        assert "proof_mismatch" in types
+
+    def test_int_and_float_timestamps_cached_separately(self):
+        from xycore.crypto import compute_xy
+
+        from app.routes.scans import _verify_entries
+
+        def entry(ts, xy):
+            return {"x": "GENESIS", "y": "y_ts", "xy": xy, "operation": "op", "timestamp": ts}
+
+        float_xy = compute_xy("GENESIS", "op", "y_ts", 7.0)
+        int_xy = compute_xy("GENESIS", "op", "y_ts", 7)
+        assert float_xy != int_xy
+        assert _verify_entries([entry(7.0, float_xy)]) == []
+        assert _verify_entries([entry(7, int_xy)]) == []
+        forged = [f["type"] for f in _verify_entries([entry(7, float_xy)])]
+        assert forged == ["proof_mismatch"]
+
+
+class TestFindingsBudget:
+    def test_broken_chain_findings_are_capped(self):
+        import asyncio
+
+        from app.routes.scans import MAX_FINDINGS, _verify_entries, _verify_entries_async
+
+        entries = [
+            {"x": f"x{i}", "y": f"y{i}", "xy": "xy_bad", "operation": "op", "timestamp": 1000.0}
+            for i in range(MAX_FINDINGS)
+        ]
+        assert len(_verify_entries(entries, max_findings=10)) == 11
+
+        findings = asyncio.run(_verify_entries_async(entries))
+        assert len(findings) == MAX_FINDINGS + 1
+        assert findings[-1]["type"] == "truncated"
+
+    def test_max_findings_option_caps_and_flags_result(self):
+        from app.models.database import Entry
+        from app.services.chain_service import chain_service
+
+        chain_id = _create_chain_with_entries()
+        with chain_service._session() as session:
+            session.query(Entry).filter(Entry.chain_id == chain_id).update(
+                {"xy": "xy_" + "0" * 64}
+            )
+            session.commit()
+
+        data = client.post(
+            "/v1/scans",
+            json={"chain_id": chain_id, "options": {"max_findings": 1}},
+            headers=AUTH_HEADER,
+        ).json()
+        assert [f["type"] for f in data["findings"]] == ["proof_mismatch", "truncated"]
+        assert data["findings_truncated"] is True
+        stored = client.get(f"/v1/scans/{data['id']}", headers=AUTH_HEADER).json()
+        assert stored["findings_truncated"] is True
+
+        data = client.post(
+            "/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER,
+        ).json()
+        assert data["findings_truncated"] is False
+
+    def test_max_findings_option_is_bounded(self):
+        from app.routes.scans import MAX_FINDINGS_LIMIT
+
+        chain_id = _create_chain_with_entries()
+        resp = client.post(
+            "/v1/scans",
+            json={"chain_id": chain_id, "options": {"max_findings": MAX_FINDINGS_LIMIT + 1}},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 422
+
+
+class TestFileChain:
+    def test_zip_members_hashed_in_order(self):
+        import hashlib
+        import io
+        import zipfile
+
+        from app.routes.scans import (
+            PARALLEL_HASH_MIN_SIZE,
+            _build_chain_from_files,
+            _extract_zip_files,
+        )
+
+        contents = {
+            f"repo-abc/f{i}.py": bytes([i]) * (PARALLEL_HASH_MIN_SIZE if i % 2 else 10)
+            for i in range(6)
+        }
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in contents.items():
+                zf.writestr(name, data)
+            zf.writestr("repo-abc/node_modules/x.js", b"skip")
+
+        files = _extract_zip_files(buf.getvalue())
+        assert files == [
+            (name.split("/", 1)[1], hashlib.sha256(data).hexdigest(), len(data))
+            for name, data in sorted(contents.items())
+        ]
+
+        entries, findings = _build_chain_from_files(files)
+        assert findings == []
+        assert entries[0]["x"] == "GENESIS"
+        assert all(e["x"] == prev["y"] for prev, e in zip(entries, entries[1:]))
+
+    def test_zip_upload_read_from_spooled_file(self):
+        import hashlib
+        import io
+        import zipfile
+
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("a.py", b"print(1)")
+            zf.writestr("b.md", b"# b")
+        resp = client.post(
+            "/v1/scans/upload",
+            files={"file": ("repo.zip", buf.getvalue(), "application/zip")},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 200
+        assert [(e["path"], e["hash"], e["size"]) for e in resp.json()["entries"]] == [
+            ("a.py", hashlib.sha256(b"print(1)").hexdigest(), 8),
+            ("b.md", hashlib.sha256(b"# b").hexdigest(), 3),
+        ]
+
+        resp = client.post(
+            "/v1/scans/upload",
+            files={"file": ("repo.zip", b"not a zip", "application/zip")},
+            headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 400
+
+
+class TestOutboundFetch:
+    def test_url_scan_streams_through_shared_client(self, monkeypatch):
+        import asyncio
+        import hashlib
+
+        import httpx
+
+        from app.routes import scans
+
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, content=b"hello")
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(scans, "_http_client", shared)
+        monkeypatch.setattr(scans, "_fetch_slots", asyncio.Semaphore(1))
+
+        resp = client.post(
+            "/v1/scans/url", json={"url": "https://example.com/x"}, headers=AUTH_HEADER,
+        )
+        assert resp.status_code == 200
+        entry = resp.json()["entries"][0]
+        assert (entry["hash"], entry["size"]) == (hashlib.sha256(b"hello").hexdigest(), 5)
+        assert seen == ["https://example.com/x"]
+
 
 class TestScanStatus:
     def test_get_scan_result(self):
@@ -184,10 +589,99 @@ class TestScanStatus:
         assert resp2.status_code == 200
         assert resp2.json()["id"] == scan_id
 
+    def test_scan_result_persisted_after_flush(self):
+        from app.routes.scans import scan_writer
+
+        chain_id = _create_chain_with_entries()
+        resp = client.post(
+            "/v1/scans",
+            json={"chain_id": chain_id},
+            headers=AUTH_HEADER,
+        )
+        scan_id = resp.json()["id"]
+
+        scan_writer.flush()
+        assert scan_writer.get(scan_id) is None
+        resp2 = client.get(f"/v1/scans/{scan_id}", headers=AUTH_HEADER)
+        assert resp2.status_code == 200
+        assert resp2.json()["chain_id"] == chain_id
+
+    def test_scan_result_kept_when_write_fails(self, monkeypatch):
+        from app.routes import scans
+
+        def broken_session():
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(scans, "_get_session", broken_session)
+        monkeypatch.setattr(scans._ScanWriter, "RETRY_DELAY", 0)
+        chain_id = _create_chain_with_entries()
+        resp = client.post(
+            "/v1/scans",
+            json={"chain_id": chain_id},
+            headers=AUTH_HEADER,
+        )
+        scan_id = resp.json()["id"]
+
+        scans.scan_writer.flush()
+        assert scans.scan_writer.get(scan_id) is not None
+        resp2 = client.get(f"/v1/scans/{scan_id}", headers=AUTH_HEADER)
+        assert resp2.status_code == 200
+
+    def test_scan_writer_close_writes_queued_rows(self):
+        from app.routes.scans import _ScanWriter
+
+        writer = _ScanWriter()
+        written = []
+        writer._write = written.extend
+        for i in range(3):
+            writer.submit({"id": f"row-{i}"})
+        writer.close(timeout=5)
+        assert [row["id"] for row in written] == ["row-0", "row-1", "row-2"]
+
+    def test_scan_result_conditional_get(self):
+        chain_id = _create_chain_with_entries()
+        resp = client.post(
+            "/v1/scans",
+            json={"chain_id": chain_id},
+            headers=AUTH_HEADER,
+        )
+        scan_id = resp.json()["id"]
+
+        for path in (f"/v1/scans/{scan_id}", f"/v1/scans/{scan_id}/receipt"):
+            first = client.get(path, headers=AUTH_HEADER)
+            assert first.status_code == 200
+            assert "immutable" in first.headers["cache-control"]
+            assert first.headers["content-length"] == str(len(first.content))
+            etag = first.headers["etag"]
+            again = client.get(path, headers={**AUTH_HEADER, "If-None-Match": etag})
+            assert again.status_code == 304
+            assert again.headers["etag"] == etag
+
+    def test_completed_scan_served_from_cache(self, monkeypatch):
+        from app.routes import scans
+
+        chain_id = _create_chain_with_entries()
+        scan_id = client.post(
+            "/v1/scans", json={"chain_id": chain_id}, headers=AUTH_HEADER,
+        ).json()["id"]
+        first = client.get(f"/v1/scans/{scan_id}", headers=AUTH_HEADER)
+
+        def fail(_scan_id):
+            raise AssertionError("cached scan reloaded")
+
+        monkeypatch.setattr(scans, "_load_scan", fail)
+        again = client.get(f"/v1/scans/{scan_id}", headers=AUTH_HEADER)
+        assert again.status_code == 200
+        assert again.json() == first.json()
+
     def test_scan_not_found(self):
-        resp = client.get("/v1/scans/nonexistent", headers=AUTH_HEADER)
+        resp = client.get("/v1/scans/000000000000", headers=AUTH_HEADER)
         assert resp.status_code == 404
 
+    def test_malformed_scan_id_rejected(self):
+        resp = client.get("/v1/scans/nonexistent", headers=AUTH_HEADER)
+        assert resp.status_code == 422
+
 
 class TestHTMLExportSeparator:
     """Verify the HTML export uses ':' separator matching xycore.compute_xy."""
@@ -13,6 +13,7 @@ Tests every route for:
 from __future__ import annotations
 
 import json
+import socket
 import time
 
 import pytest
@@ -24,6 +25,19 @@ from app.core.rate_limit import rate_limiter
 
 client = TestClient(app, raise_server_exceptions=False)
 
+
+def _public_getaddrinfo(host, port, *args, **kwargs):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.215.14", port))]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _offline_dns():
+    """Resolve webhook hostnames to a public address without the network."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(socket, "getaddrinfo", _public_getaddrinfo)
+        yield
+
+
 # Valid auth
 TEST_KEY = generate_api_key("pv_test_")
 AUTH = {"Authorization": f"Bearer {TEST_KEY}"}
@@ -405,6 +419,46 @@ class TestWebhookSecurity:
         )
         assert resp.status_code == 200
 
+    def test_webhook_list_scoped_to_owner(self):
+        resp = client.post(
+            "/v1/webhooks",
+            json={"url": "https://example.com/mine", "events": ["chain.created"]},
+            headers=AUTH_2,
+        )
+        webhook_id = resp.json()["id"]
+        mine = client.get("/v1/webhooks", headers=AUTH_2).json()["webhooks"]
+        assert webhook_id in [wh["id"] for wh in mine]
+        assert all("user_id" not in wh for wh in mine)
+        theirs = client.get("/v1/webhooks", headers=AUTH).json()["webhooks"]
+        assert webhook_id not in [wh["id"] for wh in theirs]
+
+        client.delete(f"/v1/webhooks/{webhook_id}", headers=AUTH_2)
+        mine = client.get("/v1/webhooks", headers=AUTH_2).json()["webhooks"]
+        assert webhook_id not in [wh["id"] for wh in mine]
+
+    def test_webhook_blocks_host_resolving_to_loopback(self, monkeypatch):
+        def fake_getaddrinfo(host, port, *args, **kwargs):
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+
+        monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+        resp = client.post(
+            "/v1/webhooks",
+            json={"url": "https://rebind.example.com/hook", "events": ["chain.created"]},
+            headers=AUTH,
+        )
+        assert resp.status_code == 400
+
+    def test_webhook_detail_hides_owner(self):
+        resp = client.post(
+            "/v1/webhooks",
+            json={"url": "https://detail.example.com/hook", "events": ["chain.created"]},
+            headers=AUTH,
+        )
+        assert resp.status_code == 200
+        webhook_id = resp.json()["id"]
+        detail = client.get(f"/v1/webhooks/{webhook_id}", headers=AUTH).json()
+        assert "user_id" not in detail
+
     def test_webhook_update_validates_url(self):
         # Create a valid webhook
         resp = client.post(
@@ -542,9 +596,13 @@ class TestPublicEndpoints:
         assert resp.status_code == 200
 
     def test_receipt_badge_no_auth(self):
-        resp = client.get("/v1/receipts/nonexistent/badge")
+        resp = client.get("/v1/receipts/000000000000/badge")
         assert resp.status_code == 404  # 404, not 401
 
+    def test_receipt_badge_malformed_id(self):
+        resp = client.get("/v1/receipts/nonexistent/badge")
+        assert resp.status_code == 422
+
     def test_webhook_events_list_no_auth(self):
         resp = client.get("/v1/webhooks/events/list")
         assert resp.status_code == 200
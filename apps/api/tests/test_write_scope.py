@@ -10,6 +10,8 @@ A read-only JWT must get 200 on every read route.
 
 from __future__ import annotations
 
+import socket
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -34,6 +36,18 @@ KEY_AUTH = {"Authorization": f"Bearer {API_KEY}"}
 # ── Fixtures ──────────────────────────────────────────────────
 
 
+def _public_getaddrinfo(host, port, *args, **kwargs):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.215.14", port))]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _offline_dns():
+    """Resolve webhook hostnames to a public address without the network."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(socket, "getaddrinfo", _public_getaddrinfo)
+        yield
+
+
 @pytest.fixture(scope="module")
 def chain_id():
     """Create a chain for tests to reference."""